@@ -17,45 +17,130 @@ import json
 import os
 import re
 from pathlib import Path
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union
 import argparse
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import partial
 
+# orjson is a C-accelerated JSON parser/serializer; fall back to the stdlib when absent
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-def load_json_file(file_path: Path) -> List[Dict[str, Any]]:
+# ijson streams the items of large JSON arrays without materializing the whole array
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Markdown image tags left by the marker tool: ![alt](url)
+# Negated classes keep the match linear (no lazy backtracking) and line-bound like ".*?"
+_IMG_RE = re.compile(r'!\[[^\]\n]*\]\([^)\n]*\)')
+
+# Wrapper prefix left by the marker tool around the document text
+_MD_PREFIX = "markdown='"
+
+# Fields of a complete FDA record (see fda_watcher.py output)
+_FDA_FIELDS = frozenset({"Title", "Webpage", "Description", "Date", "Corpus", "RAG_ID"})
+
+# JSONL output is written through a buffer of this size (1 MiB)
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Number of files handed to each worker process at a time
+WORKER_CHUNKSIZE = 16
+
+# Files larger than this (64 MiB) are streamed to the output by the main
+# process: a worker would hold the file's whole JSONL chunk in memory and
+# pickle it back
+STREAM_FILE_BYTES = 64 << 20
+
+# Intermediate directory names that never make a meaningful source name
+_SKIP_DIR_NAMES = frozenset({"data", "processed", "processed-json"})
+
+
+def _json_loads(raw: bytes) -> Any:
+    """Parses raw JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _json_dumps(obj: Dict[str, Any]) -> bytes:
+    """Serializes an object to compact UTF-8 JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def _first_non_whitespace_byte(f) -> bytes:
+    """Returns the first non-whitespace byte of a binary file and rewinds it."""
+    first = b''
+    while True:
+        chunk = f.read(4096)
+        if not chunk:
+            break
+        stripped = chunk.lstrip()
+        if stripped:
+            first = stripped[:1]
+            break
+    f.seek(0)
+    return first
+
+
+def load_json_file(file_path: Path) -> Iterator[Dict[str, Any]]:
     """
-    Loads a JSON file and returns a list of objects.
+    Loads a JSON file and yields its objects one at a time.
     
     Handles two cases:
-    - If JSON is a single object: converts it to a list with one element
-    - If JSON is an array: returns all objects in the array
+    - If JSON is a single object: yields that object
+    - If JSON is an array: yields each object in the array. When ijson is
+      available the array is streamed, so peak memory stays at one record
     
     Args:
         file_path: Path to the JSON file
         
-    Returns:
-        List of dictionaries (JSON objects)
+    Yields:
+        Dictionaries (JSON objects)
+        
+    Raises:
+        Parse errors of a streamed array. The objects before the error have
+        already been yielded, so callers must discard them.
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # If it's a single object (dict), convert to list
-        if isinstance(data, dict):
-            return [data]
-        # If it's an array, return as is
-        elif isinstance(data, list):
-            return data
-        else:
-            print(f"⚠️  Warning: {file_path} contains unexpected type: {type(data)}")
-            return []
-    except json.JSONDecodeError as e:
-        print(f"❌ Error parsing JSON in {file_path}: {e}")
-        return []
+        f = open(file_path, 'rb')
     except Exception as e:
         print(f"❌ Error reading {file_path}: {e}")
-        return []
+        return
+    
+    with f:
+        if IJSON_AVAILABLE and _first_non_whitespace_byte(f) == b'[':
+            # Parse errors are not caught here: a truncated array must fail
+            # the whole file, not end it quietly after its leading objects
+            yield from ijson.items(f, 'item', use_float=True)
+            return
+        
+        try:
+            data = _json_loads(f.read())
+        except json.JSONDecodeError as e:
+            print(f"❌ Error parsing JSON in {file_path}: {e}")
+            return
+        except Exception as e:
+            print(f"❌ Error reading {file_path}: {e}")
+            return
+    
+    # If it's a single object (dict), yield it alone
+    if isinstance(data, dict):
+        yield data
+    # If it's an array, yield each element
+    elif isinstance(data, list):
+        yield from data
+    else:
+        print(f"⚠️  Warning: {file_path} contains unexpected type: {type(data)}")
 
 
 def transform_to_rag_format(obj: Dict[str, Any], source_name: str) -> Dict[str, Any]:
@@ -76,6 +161,23 @@ def transform_to_rag_format(obj: Dict[str, Any], source_name: str) -> Dict[str,
     Returns:
         Transformed object with RAG-compatible fields
     """
+    # Fast path: complete FDA record with content and date, so none of the
+    # generic fallbacks below can apply. Same fields, same order.
+    if _FDA_FIELDS <= obj.keys():
+        corpus = obj["Corpus"]
+        date = obj["Date"]
+        if corpus and date:
+            return {
+                "content": clean_content(corpus),
+                "source": source_name,
+                "url": obj["Webpage"],
+                "date": date,
+                "version": "1.0",
+                "title": obj["Title"],
+                "description": obj["Description"],
+                "rag_id": obj["RAG_ID"]
+            }
+    
     transformed = {}
     
     # FDA format: Title, Webpage, Description, Date, Corpus, RAG_ID
@@ -104,23 +206,36 @@ def transform_to_rag_format(obj: Dict[str, Any], source_name: str) -> Dict[str,
         transformed["version"] = "1.0"
     
     # Content cleanup: remove artifacts from marker tool
-    content = transformed.get("content", "")
+    transformed["content"] = clean_content(transformed.get("content", ""))
+    
+    return transformed
+
+
+def clean_content(content: str) -> str:
+    """
+    Removes marker tool artifacts from document content.
+    
+    Args:
+        content: Raw content (Corpus) of a FDA document
+        
+    Returns:
+        Cleaned content
+    """
+    # Nothing to clean (no wrapper, image tag or escaped newline): only strip
+    needs_cleanup = content.startswith(_MD_PREFIX) or '![' in content or '\\n' in content
+    if not needs_cleanup:
+        return content.strip()
     
     # 1. Wrapper cleanup: remove "markdown='" prefix and trailing quote
-    if content.startswith("markdown='"):
-        content = content[10:]  # Remove first 10 characters
-        if content.endswith("'"):
-            content = content[:-1]  # Remove trailing single quote
+    unwrapped = content.removeprefix(_MD_PREFIX)
+    if unwrapped is not content:
+        content = unwrapped.removesuffix("'")  # Remove trailing single quote
     
     # 2. Image cleanup: remove Markdown image tags (won't be uploaded to cloud)
-    content = re.sub(r'!\[.*?\]\(.*?\)', '', content)
+    content = _IMG_RE.sub('', content)
     
     # 3. Normalization: convert escaped newlines and clean extra whitespace
-    content = content.replace("\\n", "\n").strip()
-    
-    transformed["content"] = content
-    
-    return transformed
+    return content.replace("\\n", "\n").strip()
 
 
 def find_json_files_in_directory(directory: str, recursive: bool = True) -> List[Path]:
@@ -141,32 +256,155 @@ def find_json_files_in_directory(directory: str, recursive: bool = True) -> List
         print(f"⚠️  Warning: Directory {directory} does not exist")
         return []
     
-    if recursive:
-        # Search recursively
-        json_files.extend(dir_path.rglob("*.json"))
-    else:
+    # os.walk filters plain name strings; Path objects are only built for matches
+    for root, _dirs, files in os.walk(directory):
+        root_path = None
+        for name in files:
+            if name.endswith(".json"):
+                if root_path is None:
+                    root_path = Path(root)
+                json_files.append(root_path / name)
+        
         # Only in current directory
-        json_files.extend(dir_path.glob("*.json"))
+        if not recursive:
+            break
     
+    # Sorted so the JSONL output order is deterministic
     return sorted(json_files)
 
 
+def iter_jsonl_lines(
+    json_file: Path,
+    source_name: str,
+    transform_for_rag: bool = True,
+    add_source_info: bool = False,
+    cwd: Optional[Path] = None
+) -> Iterator[bytes]:
+    """
+    Yields the JSONL lines of a single JSON file, one object at a time.
+    
+    Errors are raised, possibly after some lines were yielded (see
+    process_file and stream_file).
+    
+    Args:
+        json_file: Path to the JSON file
+        source_name: Source name (derived from directory)
+        transform_for_rag: If True, transforms fields to RAG-compatible format
+        add_source_info: If True, adds source file information to each object
+        cwd: Base directory for "_source_relative" (default: current directory)
+        
+    Yields:
+        Serialized JSON lines (newline-terminated)
+    """
+    # Source file information is the same for every object of the file
+    if add_source_info:
+        source_file = str(json_file)
+        source_relative = str(json_file.relative_to(cwd or Path.cwd()))
+    
+    # Stream objects from file
+    for obj in load_json_file(json_file):
+        # Transform to RAG format if enabled
+        if transform_for_rag:
+            obj = transform_to_rag_format(obj, source_name)
+        
+        # Optionally add source file information
+        if add_source_info:
+            obj["_source_file"] = source_file
+            obj["_source_relative"] = source_relative
+        
+        # Serialize as a JSON line (no spaces, compact)
+        yield _json_dumps(obj) + b'\n'
+
+
+def process_file(json_file: Path, **options) -> Tuple[bytes, int]:
+    """
+    Converts a single JSON file into a chunk of JSONL lines.
+    
+    Runs inside worker processes: it only parses, transforms and serializes,
+    the caller writes the chunk and accumulates statistics.
+    
+    Args:
+        json_file: Path to the JSON file
+        **options: Options of iter_jsonl_lines
+        
+    Returns:
+        Tuple with the serialized JSONL lines and the number of objects in them
+        (empty chunk and 0 if the file is empty or could not be processed)
+    """
+    chunk = bytearray()
+    count = 0
+    
+    try:
+        for line in iter_jsonl_lines(json_file, **options):
+            chunk += line
+            count += 1
+    except Exception as e:
+        print(f"❌ Error processing {json_file}: {e}")
+        return b'', 0
+    
+    return bytes(chunk), count
+
+
+def stream_file(outfile, json_file: Path, **options) -> int:
+    """
+    Writes the JSONL lines of a single (large) JSON file straight to outfile,
+    so memory stays at one record.
+    
+    Args:
+        outfile: Binary output file (seekable)
+        json_file: Path to the JSON file
+        **options: Options of iter_jsonl_lines
+        
+    Returns:
+        Number of objects written (0 if the file is empty or could not be
+        processed; lines already written for it are then removed)
+    """
+    start = outfile.tell()
+    count = 0
+    
+    try:
+        for line in iter_jsonl_lines(json_file, **options):
+            outfile.write(line)
+            count += 1
+    except Exception as e:
+        print(f"❌ Error processing {json_file}: {e}")
+        outfile.seek(start)
+        outfile.truncate()
+        return 0
+    
+    return count
+
+
+def _is_large_file(path: Path) -> bool:
+    """True if the file is streamed by the main process (see STREAM_FILE_BYTES)."""
+    try:
+        return path.stat().st_size > STREAM_FILE_BYTES
+    except OSError:
+        return False  # Reported when it is read
+
+
 def combine_json_to_jsonl(
     input_directory: str,
     output_file: str,
     recursive: bool = True,
     add_source_info: bool = False,
-    transform_for_rag: bool = True
+    transform_for_rag: bool = True,
+    max_workers: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Combines JSON files from a directory into a JSONL file.
     
+    Files are parsed and serialized in a process pool; the main process only
+    writes the resulting chunks, in file order. Files over STREAM_FILE_BYTES
+    are streamed to the output by the main process instead.
+    
     Args:
         input_directory: Directory to search for JSON files
         output_file: Output JSONL file path
         recursive: If True, searches recursively in subdirectories
         add_source_info: If True, adds source file information to each object
         transform_for_rag: If True, transforms fields to RAG-compatible format
+        max_workers: Number of worker processes (default: CPU count, 1 disables the pool)
         
     Returns:
         Dictionary with process statistics
@@ -189,7 +427,7 @@ def combine_json_to_jsonl(
     dir_path = Path(input_directory).resolve()
     
     # If we're in a subdirectory like "processed-json" or "processed", look higher
-    if dir_path.name in ["processed", "processed-json", "data"]:
+    if dir_path.name in _SKIP_DIR_NAMES:
         # Search up the hierarchy for a directory with "fda" or "rag" in the name
         current = dir_path.parent
         source_name = None
@@ -197,12 +435,13 @@ def combine_json_to_jsonl(
         # Search up to 3 levels
         for _ in range(3):
             if current and current.name:
+                name_lc = current.name.lower()
                 # If name contains "fda" or "rag", use it
-                if "fda" in current.name.lower() or "rag" in current.name.lower():
+                if "fda" in name_lc or "rag" in name_lc:
                     source_name = current.name
                     break
                 # If not "data" or "processed", it might also be valid
-                elif current.name.lower() not in ["data", "processed", "processed-json"]:
+                elif name_lc not in _SKIP_DIR_NAMES:
                     source_name = current.name
                     break
             current = current.parent
@@ -236,45 +475,60 @@ def combine_json_to_jsonl(
     print(f"📝 Writing to: {output_file}")
     print("-" * 60)
     
-    # Process each JSON file
-    with open(output_file, 'w', encoding='utf-8') as outfile:
-        for idx, json_file in enumerate(json_files, 1):
-            try:
-                # Load objects from file
-                objects = load_json_file(json_file)
+    # Process each JSON file (in parallel when there is more than one)
+    workers = max_workers or os.cpu_count() or 1
+    options = {
+        "source_name": source_name,
+        "transform_for_rag": transform_for_rag,
+        "add_source_info": add_source_info,
+        "cwd": Path.cwd()
+    }
+    worker = partial(process_file, **options)
+    large_files = {json_file for json_file in json_files if _is_large_file(json_file)}
+    pooled_files = [json_file for json_file in json_files if json_file not in large_files]
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 and len(pooled_files) > 1 else None
+    
+    # Write to a temporary file first and rename it over the output at the end,
+    # so a crash never leaves a half-written JSONL behind
+    tmp_path = Path(str(output_file) + '.tmp')
+    
+    try:
+        if executor:
+            results = executor.map(worker, pooled_files, chunksize=WORKER_CHUNKSIZE)
+        else:
+            results = map(worker, pooled_files)
+        
+        with open(tmp_path, 'wb', buffering=WRITE_BUFFER_SIZE) as outfile:
+            for idx, json_file in enumerate(json_files, 1):
+                if json_file in large_files:
+                    count = stream_file(outfile, json_file, **options)
+                else:
+                    # Pool results come in pooled_files (= file) order
+                    chunk, count = next(results)
+                    if count:
+                        outfile.write(chunk)
                 
-                if not objects:
+                # Empty or unreadable file
+                if not count:
                     stats["errors"] += 1
                     continue
                 
-                # Write each object as a JSONL line
-                for obj in objects:
-                    # Transform to RAG format if enabled
-                    if transform_for_rag:
-                        obj = transform_to_rag_format(obj, source_name)
-                    
-                    # Optionally add source file information
-                    if add_source_info:
-                        obj["_source_file"] = str(json_file)
-                        obj["_source_relative"] = str(json_file.relative_to(Path.cwd()))
-                    
-                    # Write as a JSON line (no spaces, compact)
-                    json_line = json.dumps(obj, ensure_ascii=False)
-                    outfile.write(json_line + '\n')
-                    
-                    stats["total_objects"] += 1
-                    stats["objects_per_file"][json_file.name] += 1
-                
+                stats["total_objects"] += count
+                stats["objects_per_file"][json_file.name] += count
                 stats["files_processed"] += 1
                 
                 # Show progress every 10 files
                 if idx % 10 == 0:
                     print(f"📊 Processed {idx}/{len(json_files)} files... "
                           f"({stats['total_objects']} objects so far)")
-                
-            except Exception as e:
-                print(f"❌ Error processing {json_file}: {e}")
-                stats["errors"] += 1
+        
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    finally:
+        if executor:
+            executor.shutdown()
     
     print("-" * 60)
     print(f"✅ Directory {input_directory} completed!")
@@ -294,7 +548,8 @@ def process_multiple_directories(
     output_dir: str = "Output",
     recursive: bool = True,
     add_source_info: bool = False,
-    transform_for_rag: bool = True
+    transform_for_rag: bool = True,
+    max_workers: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Processes multiple directories and generates a separate JSONL for each.
@@ -305,6 +560,7 @@ def process_multiple_directories(
         recursive: If True, searches recursively in subdirectories
         add_source_info: If True, adds source file information to each object
         transform_for_rag: If True, transforms fields to RAG-compatible format
+        max_workers: Number of worker processes per directory (default: CPU count)
         
     Returns:
         Dictionary with general statistics
@@ -348,7 +604,8 @@ def process_multiple_directories(
             output_file=str(output_file),
             recursive=recursive,
             add_source_info=add_source_info,
-            transform_for_rag=transform_for_rag
+            transform_for_rag=transform_for_rag,
+            max_workers=max_workers
         )
         
         # Accumulate statistics
@@ -400,6 +657,9 @@ Usage examples:
 
   # Only search in main directory (non-recursive)
   python combine_json_to_jsonl.py -d data/processed-json --no-recursive
+
+  # Limit the number of worker processes
+  python combine_json_to_jsonl.py -d data/processed-json --workers 4
         """
     )
     
@@ -434,6 +694,13 @@ Usage examples:
         help='Do not transform fields to RAG format (preserve original fields)'
     )
     
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=None,
+        help='Number of worker processes (default: CPU count, 1 = sequential)'
+    )
+    
     args = parser.parse_args()
     
     # Execute the process
@@ -442,7 +709,8 @@ Usage examples:
         output_dir=args.output_dir,
         recursive=not args.no_recursive,
         add_source_info=args.add_source,
-        transform_for_rag=not args.no_transform
+        transform_for_rag=not args.no_transform,
+        max_workers=args.workers
     )
     
     return 0 if stats["total_errors"] == 0 else 1
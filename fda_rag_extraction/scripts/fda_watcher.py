@@ -5,21 +5,45 @@ This is the "Intelligence Engine" of the Pipeline.
 Responsibilities:
 1. Fetch the master list from the web.
 2. Generate unique IDs (Hash) to avoid duplicates in Vectors.
-3. Detect new entries (Comparison with Master Excel).
+3. Detect new entries (Comparison with Master Database).
 4. DEEP SCRAPING: Visit each new URL and extract full text content (text field).
 """
 
+import argparse
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import httpx
 import pandas as pd
 import os
 import sys
 import hashlib
+import json
+import sqlite3
+import functools
 import time
 import logging
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor
+from lxml import etree
+from urllib.parse import urljoin, urlparse
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = sys.platform != "win32"
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 # --- CONFIGURATION ---
 URL_FDA = "https://www.fda.gov/drugs/resources-information-approved-drugs/oncology-cancerhematologic-malignancies-approval-notifications"
 BASE_DOMAIN = "https://www.fda.gov"
@@ -36,7 +60,18 @@ logging.basicConfig(
     filemode='a'  # Append mode
 )
 
-MASTER_DB_FILE = "data/FDA_Oncology_Master_DB.xlsx"
+# Master database: Parquet dataset directory. Every run that finds new records
+# appends one part file, so only new data is written.
+MASTER_DB_DIR = "data/FDA_Oncology_Master_DB"
+# Excel copy of the master for human review (written with --export-excel)
+MASTER_DB_EXCEL_FILE = "data/FDA_Oncology_Master_DB.xlsx"
+# Single-file masters of older versions, migrated to MASTER_DB_DIR on first run
+LEGACY_MASTER_DB_FILES = ("data/FDA_Oncology_Master_DB.parquet", MASTER_DB_EXCEL_FILE)
+# ETag / Last-Modified of the last processed listing (for conditional GETs)
+LISTING_VALIDATORS_FILE = "data/listing_validators.json"
+# Scraped page texts by RAG_ID, so an interrupted run resumes where it stopped
+SCRAPE_CACHE_FILE = "data/scrape_cache.db"
+SCRAPE_CACHE_COMMIT_EVERY = 10  # Cached texts written per transaction
 
 # Output files for RAG
 FILE_INITIAL = "data/rag_initial_load.json"
@@ -50,9 +85,25 @@ RETRY_DELAY = 1.0  # seconds (will increase with backoff)
 DELAY_STANDARD = 0.5  # Standard delay between normal requests
 DELAY_NODE_URL = 2.0  # Longer delay for /node/... URLs (avoid saturation)
 
-# Batch processing configuration
-BATCH_SIZE = 10  # Process N records before long pause
-BATCH_DELAY = 5.0  # Long pause between batches (seconds) to avoid saturation
+# Deep scraping concurrency (requests in flight at the same time)
+MAX_CONCURRENT_REQUESTS = 8
+MAX_CONCURRENT_NODE_REQUESTS = 2  # /node/... URLs are throttled harder by the server
+MAX_CONNECTIONS = 20  # Connection pool size of the shared HTTP client
+PARSE_WORKERS = os.cpu_count() or 1  # Threads parsing pages off the event loop
+PAGE_QUEUE_SIZE = 32  # Downloaded pages waiting for the parse stage
+
+
+# Character encoding of the FDA listing page
+LISTING_ENCODING = "utf-8"
+
+# Page bodies are streamed into the parser in chunks of this size (bytes)
+STREAM_CHUNK_SIZE = 16384
+
+# Minimum length (chars) for extracted text to count as real content
+MIN_CONTENT_LENGTH = 50
+
+# Response bodies smaller than this (bytes) are error/redirect stubs, not drug pages
+MIN_HTML_BYTES = 2048
 
 # ==========================================
 # 1. AUXILIARY TOOLS
@@ -83,22 +134,195 @@ def get_browser_headers(referer=None):
     
     return headers
 
+# Static browser headers, built once and attached to the HTTP sessions/clients
+_BROWSER_HEADERS = get_browser_headers()
+
+@functools.lru_cache(maxsize=65536)
 def generate_rag_id(text_to_hash):
     """
     Generates a unique fingerprint (MD5) based on the URL.
     This ensures the ID is always the same for the same drug.
+    Cached: repeated URLs are looked up instead of re-hashed.
+    
+    The algorithm is part of the ID contract: RAG_IDs are stored in the
+    master database, name the processed-json files and key the documents
+    in the vector store. Changing the hash (or its length) would make every
+    known record look new, so MD5 stays; hashing cost is negligible here.
     """
     if not text_to_hash:
         return None
-    return hashlib.md5(text_to_hash.encode('utf-8')).hexdigest()
+    return hashlib.md5(text_to_hash.encode('utf-8'), usedforsecurity=False).hexdigest()
+
+def save_records_json(df, output_file):
+    """
+    Writes records as a JSON array (one object per row), indented for review.
+    Uses orjson when available (UTF-8 bytes straight to disk).
+    """
+    if ORJSON_AVAILABLE:
+        # orjson writes NaN as null, like pandas.to_json
+        records = df.to_dict(orient="records")
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(records, option=orjson.OPT_INDENT_2))
+    else:
+        records = df.astype(object).where(df.notna(), None).to_dict(orient="records")
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(records, f, indent=2, ensure_ascii=False)
+
+def load_listing_validators():
+    """
+    Returns the conditional-request headers (If-None-Match / If-Modified-Since)
+    for the listing page, built from the validators of the last processed run.
+    """
+    try:
+        with open(LISTING_VALIDATORS_FILE, 'r', encoding='utf-8') as f:
+            validators = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+def save_listing_validators(validators):
+    """
+    Stores the ETag / Last-Modified of a fully processed listing response.
+    """
+    if not validators:
+        return
+    with open(LISTING_VALIDATORS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(validators, f, indent=2)
+
+def remove_temporary_outputs():
+    """Deletes the RAG JSON files of a previous run (nothing new to process)."""
+    for f in [FILE_INITIAL, FILE_DELTA]:
+        if os.path.exists(f):
+            os.remove(f)
+            print(f"🗑️ Temporary file deleted: {f}")
+
+def master_db_parts():
+    """
+    Lists the part files of the master database, oldest first.
+    (Part names carry their write timestamp, so name order is time order.)
+    """
+    if not os.path.isdir(MASTER_DB_DIR):
+        return []
+    return sorted(
+        os.path.join(MASTER_DB_DIR, name)
+        for name in os.listdir(MASTER_DB_DIR)
+        if name.startswith("part-") and name.endswith(".parquet")
+    )
 
-def initialize_session(session, initial_url):
+def read_master_db(newest_first=False):
+    """
+    Reads the whole master database into a DataFrame.
+    
+    Args:
+        newest_first: If True, records of the latest runs come first
+                      (the order of the old single-file master)
+    """
+    parts = master_db_parts()
+    if newest_first:
+        parts.reverse()
+    return pq.read_table(parts).to_pandas()
+
+def read_master_ids():
+    """
+    Reads only the RAG_ID column of the master database, as an Arrow array.
+    Delta detection needs nothing else, so the text columns are never loaded
+    or converted to pandas.
+    """
+    return pq.read_table(master_db_parts(), columns=['RAG_ID']).column('RAG_ID').combine_chunks()
+
+def write_master_part(df, replace=False):
+    """
+    Appends a DataFrame to the master database as a new part file.
+    The part is written under a hidden name and renamed when complete,
+    so readers never see a partial file.
+    
+    Args:
+        df: Records to store
+        replace: If True, the existing parts are removed (full rewrite)
+    
+    Returns:
+        str: Path of the written part
+    """
+    os.makedirs(MASTER_DB_DIR, exist_ok=True)
+    old_parts = master_db_parts() if replace else []
+    
+    name = f"part-{datetime.now().strftime('%Y%m%dT%H%M%S%f')}.parquet"
+    part_path = os.path.join(MASTER_DB_DIR, name)
+    tmp_path = os.path.join(MASTER_DB_DIR, "." + name)
+    df.to_parquet(tmp_path, engine='pyarrow', compression='zstd', index=False)
+    os.replace(tmp_path, part_path)
+    
+    for old_part in old_parts:
+        os.remove(old_part)
+    return part_path
+
+def migrate_legacy_master():
+    """
+    Converts a single-file master database of older versions (Parquet or
+    Excel) into the first part of MASTER_DB_DIR.
+    Only runs when there is no master dataset yet, so existing
+    installations keep their delta state.
+    """
+    if master_db_parts():
+        return
+    
+    for legacy_file in LEGACY_MASTER_DB_FILES:
+        if not os.path.exists(legacy_file):
+            continue
+        print(f"🔁 Migrating legacy master {legacy_file} -> {MASTER_DB_DIR}/...")
+        logging.info(f"Migrating legacy master database {legacy_file} to {MASTER_DB_DIR}")
+        try:
+            if legacy_file.endswith(".parquet"):
+                df_legacy = pd.read_parquet(legacy_file, engine='pyarrow')
+            else:
+                # Excel turns empty strings into NaN: read everything back as text
+                # so the part has the same (string) schema as the ones written later
+                df_legacy = pd.read_excel(legacy_file, dtype=str).fillna("")
+            write_master_part(df_legacy)
+            print(f"✅ Migrated {len(df_legacy)} records.")
+        except Exception as e:
+            print(f"⚠️ Could not migrate legacy master: {e}")
+            logging.warning(f"Could not migrate legacy master: {e}")
+        return
+
+def create_session():
+    """
+    Creates the requests.Session used for the listing page.
+    Mounts an adapter whose connection pool fits the concurrency and which retries
+    transient failures (throttling, gateway errors) with backoff.
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=MAX_RETRIES,
+        backoff_factor=0.3,
+        status_forcelist=[429, 502, 503, 504],
+        raise_on_status=False  # Final bad status is reported by raise_for_status()
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONCURRENT_REQUESTS, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def initialize_session(session, initial_url, conditional=False):
     """
     Initializes HTTP session by visiting the main URL to establish cookies.
     This is crucial for Drupal to recognize the session as valid.
+    The static browser headers are set once on the session, so later
+    requests don't rebuild them.
+    
+    With conditional=True the visit sends the listing validators, so an
+    unchanged listing page is not transferred for the warm-up either (the
+    304 response still carries the cookies).
     """
-    headers = get_browser_headers()
+    session.headers.update(_BROWSER_HEADERS)
     try:
+        headers = load_listing_validators() if conditional else {}
         response = session.get(initial_url, headers=headers, timeout=15)
         response.raise_for_status()
         print("✅ HTTP session initialized successfully (cookies established)")
@@ -107,24 +331,334 @@ def initialize_session(session, initial_url):
         print(f"⚠️ Warning: Could not fully initialize session: {e}")
         return False
 
-def get_full_corpus(url, session, referer=None, max_retries=MAX_RETRIES):
+def element_text(element):
+    """
+    Returns the text of an element: stripped text fragments joined by a space.
+    Equivalent to BeautifulSoup's get_text(" ", strip=True).
+    """
+    return " ".join(part for part in (text.strip() for text in element.itertext()) if part)
+
+# Main content containers of an FDA page, in priority order. Compiled once at
+# import time instead of re-parsing the expressions for every scraped page.
+CONTENT_CONTAINER_XPATHS = tuple(etree.XPath(xpath) for xpath in (
+    "//div[@role='main']",
+    "//div[contains(@class, 'field--name-body')]",
+    "//article",
+    "//div[contains(@class, 'node__content')]",
+))
+_ALL_DIVS_XPATH = etree.XPath("//div")
+
+def find_content_element(root):
+    """
+    Locates the main content container of a parsed FDA page.
+    Tries the known Drupal containers in priority order, then falls back to
+    the div with the most paragraphs and finally to <body>.
+    """
+    # 1. Try div[role="main"]
+    # 2. Try .field--name-body
+    # 3. Try article tag
+    # 4. Try .node__content (common in Drupal)
+    for find_container in CONTENT_CONTAINER_XPATHS:
+        matches = find_container(root)
+        if matches:
+            return matches[0]
+    
+    # 5. Fallback: search for any div with lots of text content.
+    #    Paragraphs are counted in a single pass: each <p> credits every
+    #    enclosing div, instead of re-walking each div's subtree.
+    all_divs = _ALL_DIVS_XPATH(root)
+    if all_divs:
+        p_counts = dict.fromkeys(all_divs, 0)
+        for p in root.iter('p'):
+            for div in p.iterancestors('div'):
+                p_counts[div] += 1
+        return max(all_divs, key=p_counts.__getitem__)
+    
+    # 6. Last fallback: body
+    return root.find("body")
+
+class ListingTableTarget:
+    """
+    lxml parser target that collects the cells of the first <table> of the
+    FDA listing page as the document streams in, without building a tree.
+    
+    Every cell keeps its text fragments (one per text node) and the href
+    of the first <a href> inside it. close() returns the rows as lists of
+    cells, or None if the page has no table.
+    """
+    
+    # Elements whose text is not page text (excluded like BeautifulSoup's get_text)
+    NON_TEXT_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+    
+    def __init__(self):
+        self.rows = []
+        self._table_depth = 0
+        self._table_seen = False
+        self._done = False
+        self._open_rows = []
+        self._open_cells = []
+        self._non_text_depth = 0
+        self._text = []
+    
+    def _flush_text(self):
+        # A text node ends at the next tag/comment: hand it to the enclosing cells
+        if self._text:
+            text = "".join(self._text)
+            self._text = []
+            for cell in self._open_cells:
+                cell["strings"].append(text)
+    
+    def start(self, tag, attrib):
+        self._flush_text()
+        if tag in self.NON_TEXT_TAGS:
+            self._non_text_depth += 1
+        if self._done:
+            return
+        if tag == "table":
+            self._table_depth += 1
+            self._table_seen = True
+        elif not self._table_depth:
+            return
+        elif tag == "tr":
+            # Rows are listed in start-tag order (matters for nested tables)
+            row = []
+            self.rows.append(row)
+            self._open_rows.append(row)
+        elif tag == "td":
+            cell = {"strings": [], "href": None}
+            for row in self._open_rows:
+                row.append(cell)
+            self._open_cells.append(cell)
+        elif tag == "a" and "href" in attrib:
+            for cell in self._open_cells:
+                if cell["href"] is None:
+                    cell["href"] = attrib["href"]
+    
+    def end(self, tag):
+        self._flush_text()
+        if tag in self.NON_TEXT_TAGS and self._non_text_depth:
+            self._non_text_depth -= 1
+        if self._done or not self._table_depth:
+            return
+        if tag == "table":
+            self._table_depth -= 1
+            # Only the first table of the page is read
+            self._done = not self._table_depth
+        elif tag == "tr" and self._open_rows:
+            self._open_rows.pop()
+        elif tag == "td" and self._open_cells:
+            self._open_cells.pop()
+    
+    def data(self, text):
+        if self._open_cells and not self._non_text_depth:
+            self._text.append(text)
+    
+    def comment(self, text):
+        self._flush_text()
+    
+    def close(self):
+        self._flush_text()
+        return self.rows if self._table_seen else None
+
+def cell_text(cell, separator=" "):
+    """Joins the stripped, non-empty text fragments of a listing cell."""
+    return separator.join(t for t in (s.strip() for s in cell["strings"]) if t)
+
+def extract_content_text(content_div):
+    """
+    Extracts the text of a page's main content container.
+    Headings, paragraphs and list items are kept in document order,
+    separated by blank lines.
+    
+    Returns:
+        str: Extracted text or empty string if no substantial content
     """
-    DEEP SCRAPING: Visits the URL and extracts detailed text.
+    if content_div is None:
+        return ""
+    
+    # Extract content preserving document order
+    text_parts = []
+    for element in content_div.iterdescendants('h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'ul', 'ol'):
+        if element.tag in ('ul', 'ol'):
+            # List - extract list items (only direct children)
+            for li in element.iterchildren('li'):
+                li_text = element_text(li)
+                if li_text:  # Only add non-empty items
+                    text_parts.append(li_text)
+        else:
+            # Heading or paragraph
+            part_text = element_text(element)
+            if part_text:
+                text_parts.append(part_text)
+    
+    # Join all parts preserving document order
+    full_text = "\n\n".join(text_parts)
+    
+    # Return only if it has substantial content
+    return full_text if len(full_text) > MIN_CONTENT_LENGTH else ""
+
+class CorpusStreamReader:
+    """
+    Parses an FDA page streamed in body chunks and extracts its main
+    content text.
+    
+    Body chunks are fed to a pull parser. As soon as the first
+    div[role="main"] (the preferred content container) is closed, feed()
+    returns True and the rest of the page does not need to be downloaded.
+    Pages without it are read to the end and go through the usual
+    find_content_element() fallbacks.
+    
+    Parsing is CPU work: feed() and text() are meant to run in worker
+    threads (asyncio.to_thread), not on the event loop. The body is only
+    buffered until it passes MIN_HTML_BYTES, so error/redirect stubs are
+    never parsed (check received before queuing the page for text()).
+    """
+    
+    def __init__(self, encoding=None):
+        self._encoding = encoding
+        self._parser = None  # Created by the first feed() past MIN_HTML_BYTES
+        self._head = []
+        self._main_div = None
+        self.received = 0
+    
+    def feed(self, chunk):
+        """
+        Feeds a body chunk. Returns True once the main content is complete,
+        i.e. reading can stop.
+        """
+        self.received += len(chunk)
+        if self._parser is None:
+            # Tiny bodies (error/redirect stubs) can't hold a drug page
+            self._head.append(chunk)
+            if self.received < MIN_HTML_BYTES:
+                return False
+            # Only <div> end events are reported; the tree is still built in full
+            self._parser = etree.HTMLPullParser(events=('end',), tag='div', encoding=self._encoding)
+            chunk = b"".join(self._head)
+            self._head = None
+        
+        self._parser.feed(chunk)
+        if self._main_div is None:
+            for _, div in self._parser.read_events():
+                # The outermost one wins (nested ones close first)
+                if div.get('role') == 'main' and not any(
+                        d.get('role') == 'main' for d in div.iterancestors('div')):
+                    self._main_div = div
+                    break
+        return self._main_div is not None
+    
+    def text(self):
+        """Returns the extracted text (empty string if no substantial content)."""
+        if self._parser is None:
+            return ""
+        if self._main_div is not None:
+            return extract_content_text(self._main_div)
+        try:
+            root = self._parser.close()
+        except etree.LxmlError:
+            return ""
+        if root is None:
+            return ""
+        return extract_content_text(find_content_element(root))
+
+class ScrapeCache:
+    """
+    On-disk cache of scraped texts keyed by RAG_ID (SQLite).
+    
+    Only non-empty texts are stored, so failed pages (403/404, empty
+    extraction) are retried on the next run. If a run dies before the
+    master database is updated, the rerun reuses every page already scraped.
+    """
+    
+    def __init__(self, path=SCRAPE_CACHE_FILE):
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS scrape_cache ("
+            "rag_id TEXT PRIMARY KEY, text TEXT NOT NULL, fetched_at INTEGER NOT NULL)"
+        )
+        self._pending = 0
+    
+    def get(self, rag_id):
+        """Returns the cached text of a record, or None if it was never scraped."""
+        row = self._conn.execute(
+            "SELECT text FROM scrape_cache WHERE rag_id = ?", (rag_id,)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def put(self, rag_id, text):
+        """Stores the text of a record (empty texts are not cached)."""
+        if not text:
+            return
+        self._conn.execute(
+            "INSERT OR REPLACE INTO scrape_cache (rag_id, text, fetched_at) VALUES (?, ?, ?)",
+            (rag_id, text, int(time.time()))
+        )
+        self._pending += 1
+        if self._pending >= SCRAPE_CACHE_COMMIT_EVERY:
+            self._conn.commit()
+            self._pending = 0
+    
+    def close(self):
+        """Commits pending entries and closes the database."""
+        self._conn.commit()
+        self._conn.close()
+
+class AsyncRateLimiter:
+    """
+    Per-host request pacing shared by all concurrent tasks.
+    Each request reserves the next start slot and pushes the following one
+    back by its own interval, so tasks queue for their turn instead of each
+    sleeping a fixed delay, and other hosts proceed in parallel.
+    """
+    
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+    
+    async def acquire(self, interval):
+        """
+        Waits until the next request slot is available and reserves it.
+        
+        Args:
+            interval: Minimum time (seconds) before the next request to this host
+        """
+        async with self._lock:
+            now = time.monotonic()
+            if self._next_start > now:
+                await asyncio.sleep(self._next_start - now)
+                now = time.monotonic()
+            self._next_start = now + interval
+
+def get_rate_limiter(limiters, url):
+    """
+    Returns the rate limiter of a URL's host, creating it on first use.
+    """
+    host = urlparse(url).netloc
+    if host not in limiters:
+        limiters[host] = AsyncRateLimiter()
+    return limiters[host]
+
+async def fetch_corpus_page(url, client, limiters, referer=None, max_retries=MAX_RETRIES):
+    """
+    DEEP SCRAPING: Visits the URL and downloads the page for text extraction.
     
     SIMPLE AND EFFECTIVE STRATEGY:
-    - Longer delays for /node/... URLs to avoid saturation
-    - allow_redirects=True to automatically follow redirects
+    - Per-host rate limits (longer for /node/... URLs) to avoid saturation
+    - follow_redirects=True to automatically follow redirects
     - Multiple selectors to extract content
     - Clear error handling
     
     Args:
         url: URL to extract
-        session: requests.Session to reuse connections
+        client: httpx.AsyncClient to reuse connections
+        limiters: Dict of AsyncRateLimiter shared by all concurrent tasks
         referer: Referer URL for Referer header
         max_retries: Maximum number of retries for connection errors
     
     Returns:
-        str: Extracted text or empty string if 403/404 error
+        CorpusStreamReader holding the downloaded page (its text() is the
+        extracted text), or a str if there is nothing to parse: empty
+        string on 403/404/errors, placeholder for PDF documents
     """
     # Basic validations
     if not url or "http" not in url:
@@ -134,129 +668,69 @@ def get_full_corpus(url, session, referer=None, max_retries=MAX_RETRIES):
     
     # Detect if it's a /node/... URL to apply longer delay
     is_node_url = "/node/" in url
-    delay_time = DELAY_NODE_URL if is_node_url else DELAY_STANDARD
+    limiter = get_rate_limiter(limiters, url)
     
-    headers = get_browser_headers(referer=referer or URL_FDA)
+    # Static browser headers live on the client; only the navigation context varies
+    headers = {"Referer": referer or URL_FDA, "Sec-Fetch-Site": "same-origin"}
     
     # Retry logic for connection errors (not for 403/404)
     for attempt in range(max_retries):
         try:
-            # Pause before request (longer for /node/ URLs)
-            time.sleep(delay_time)
-            
-            # Attempt to access URL with automatic redirects
-            resp = session.get(url, headers=headers, timeout=20, allow_redirects=True)
-            
-            # Check if there was a redirect
-            if resp.history and url != resp.url:
-                final_url = resp.url
-                if is_node_url and "/node/" not in final_url:
-                    print(f"      ↳ ✓ Successful redirect: {final_url[:70]}...")
+            # Wait for this host's next request slot (longer spacing after /node/ URLs)
+            await limiter.acquire(DELAY_NODE_URL if is_node_url else DELAY_STANDARD)
             
-            # Explicit status code handling
-            if resp.status_code == 200:
-                soup = BeautifulSoup(resp.text, 'lxml')
-                
-                # Extraction strategy: try multiple selectors
-                content_div = None
-                
-                # 1. Try div[role="main"]
-                content_div = soup.find('div', role='main')
-                
-                # 2. Try .field--name-body
-                if not content_div:
-                    content_div = soup.find('div', class_=lambda x: x and 'field--name-body' in x)
-                
-                # 3. Try article tag
-                if not content_div:
-                    content_div = soup.find('article')
-                
-                # 4. Try .node__content (common in Drupal)
-                if not content_div:
-                    content_div = soup.find('div', class_=lambda x: x and 'node__content' in x)
-                
-                # 5. Fallback: search for any div with lots of text content
-                if not content_div:
-                    all_divs = soup.find_all('div')
-                    if all_divs:
-                        content_div = max(all_divs, key=lambda d: len(d.find_all('p')))
+            # Attempt to access URL with automatic redirects (body is streamed)
+            async with client.stream("GET", url, headers=headers, timeout=20, follow_redirects=True) as resp:
+                # Check if there was a redirect
+                final_url = str(resp.url)
+                if resp.history and url != final_url:
+                    if is_node_url and "/node/" not in final_url:
+                        print(f"      ↳ ✓ Successful redirect: {final_url[:70]}...")
                 
-                # 6. Last fallback: body
-                if not content_div:
-                    content_div = soup.body
+                # Explicit status code handling
+                if resp.status_code == 200:
+                    # Stream raw bytes into lxml (no decoding in Python) and stop
+                    # downloading once the main content container is complete.
+                    # Feeding builds the tree, so it runs in a worker thread.
+                    # charset_encoding is only set when the server declares a charset.
+                    reader = CorpusStreamReader(resp.charset_encoding)
+                    async for chunk in resp.aiter_bytes(STREAM_CHUNK_SIZE):
+                        if await asyncio.to_thread(reader.feed, chunk):
+                            break
+                    # Tiny bodies (error/redirect stubs) skip the parse stage
+                    if reader.received < MIN_HTML_BYTES:
+                        return ""
+                    # Text extraction is left to the parse stage of scrape_records
+                    return reader
                 
-                if content_div:
-                    # Extract content preserving document order
-                    # Walk through all direct children and descendants in document order
-                    text_parts = []
-                    
-                    # Get all relevant elements in document order using find_all with multiple tags
-                    # This preserves the order they appear in the HTML
-                    all_elements = content_div.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'ul', 'ol'])
-                    
-                    # Process elements in order
-                    for element in all_elements:
-                        tag_name = element.name
-                        
-                        if tag_name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                            # Heading
-                            heading_text = element.get_text(" ", strip=True)
-                            if heading_text:
-                                text_parts.append(heading_text)
-                        
-                        elif tag_name == 'p':
-                            # Paragraph
-                            para_text = element.get_text(" ", strip=True)
-                            if para_text:
-                                text_parts.append(para_text)
-                        
-                        elif tag_name in ['ul', 'ol']:
-                            # List - extract list items
-                            for li in element.find_all('li', recursive=False):  # Only direct children
-                                li_text = li.get_text(" ", strip=True)
-                                if li_text:  # Only add non-empty items
-                                    text_parts.append(li_text)
-                    
-                    # Join all parts preserving document order
-                    full_text = "\n\n".join(text_parts)
+                elif resp.status_code == 403:
+                    # 403 Forbidden: Server is blocking access
+                    # For /node/ URLs, try with longer delay if first attempt
+                    if is_node_url and attempt == 0:
+                        print(f"      ↳ [403] Attempt {attempt + 1}/{max_retries}: Waiting longer before retrying...")
+                        await asyncio.sleep(DELAY_NODE_URL * 2)  # Double delay before retrying
+                        continue
                     
-                    # Return only if it has substantial content
-                    if len(full_text) > 50:
-                        return full_text
-                    else:
-                        return ""
+                    # Report error after all attempts
+                    print(f"   ❌ [403 FORBIDDEN] Could not access after {attempt + 1} attempts: {url[:80]}...")
+                    if is_node_url:
+                        print(f"      💡 Note: This /node/... URL exists but requires more time or special conditions")
+                    return ""
                 
-                return ""
-            
-            elif resp.status_code == 403:
-                # 403 Forbidden: Server is blocking access
-                # For /node/ URLs, try with longer delay if first attempt
-                if is_node_url and attempt == 0:
-                    print(f"      ↳ [403] Attempt {attempt + 1}/{max_retries}: Waiting longer before retrying...")
-                    time.sleep(DELAY_NODE_URL * 2)  # Double delay before retrying
-                    continue
+                elif resp.status_code == 404:
+                    print(f"   ❌ [404 NOT FOUND] URL not found: {url[:80]}...")
+                    return ""
                 
-                # Report error after all attempts
-                print(f"   ❌ [403 FORBIDDEN] Could not access after {attempt + 1} attempts: {url[:80]}...")
-                if is_node_url:
-                    print(f"      💡 Note: This /node/... URL exists but requires more time or special conditions")
-                return ""
-            
-            elif resp.status_code == 404:
-                print(f"   ❌ [404 NOT FOUND] URL not found: {url[:80]}...")
-                return ""
-            
-            else:
-                print(f"   ⚠️ [HTTP {resp.status_code}] Error accessing: {url[:80]}...")
-                return ""
+                else:
+                    print(f"   ⚠️ [HTTP {resp.status_code}] Error accessing: {url[:80]}...")
+                    return ""
                 
-        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, 
-                requests.exceptions.RequestException) as e:
+        except httpx.RequestError as e:
             # Connection errors: retry with backoff
             if attempt < max_retries - 1:
                 wait_time = RETRY_DELAY * (2 ** attempt)
                 print(f"   ⚠️ Connection error (attempt {attempt + 1}/{max_retries}): {str(e)[:60]}... Retrying in {wait_time}s...")
-                time.sleep(wait_time)
+                await asyncio.sleep(wait_time)
             else:
                 print(f"   ❌ [CONNECTION ERROR] Failed after {max_retries} attempts: {url[:80]}...")
                 return ""
@@ -267,11 +741,119 @@ def get_full_corpus(url, session, referer=None, max_retries=MAX_RETRIES):
     
     return ""
 
+async def scrape_records(rows, cookies, cache=None):
+    """
+    DEEP SCRAPING: fetches the pages of all records over one shared client.
+    
+    Runs as a three-stage pipeline connected by queues, so network, CPU
+    and disk work overlap:
+    1. Fetchers download pages (MAX_CONCURRENT_REQUESTS of them, plus
+       MAX_CONCURRENT_NODE_REQUESTS dedicated to /node/... URLs). Every host
+       is paced by its own rate limiter, so no fixed pauses are needed.
+    2. Parsers extract the text of downloaded pages in worker threads.
+    3. A single writer stores each text as soon as it is ready (and in the
+       cache, so an interrupted run loses nothing already scraped).
+    Each stage is shut down with one None sentinel per consumer.
+    
+    Args:
+        rows: Records (DataFrame rows) to scrape
+        cookies: Cookies established by initialize_session
+        cache: Optional ScrapeCache; cached records are not fetched again
+    
+    Returns:
+        list: Extracted text for each row, in order ("" for rows without URL)
+    """
+    # Page parsing (feeding the streamed bodies and extracting their text)
+    # runs via asyncio.to_thread: bound it to one thread per core (lxml
+    # releases the GIL while building the tree)
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=PARSE_WORKERS))
+    
+    limiters = {}
+    limits = httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONCURRENT_REQUESTS)
+    total = len(rows)
+    texts = [""] * total
+    
+    # Rows are already in memory, so the URL queues are unbounded (a full
+    # /node/ queue must never hold back normal fetches). Downloaded pages
+    # carry their parsed tree and are bounded to cap memory.
+    url_queue = asyncio.Queue()
+    node_url_queue = asyncio.Queue()
+    page_queue = asyncio.Queue(maxsize=PAGE_QUEUE_SIZE)
+    text_queue = asyncio.Queue()
+    
+    async with httpx.AsyncClient(http2=True, cookies=cookies, headers=_BROWSER_HEADERS, limits=limits) as client:
+        
+        async def fetcher(queue):
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                idx, row = item
+                is_node_url = "/node/" in row['Webpage']
+                print(f"   [{idx}/{total}] Extracting: {row['Title'][:50]}...")
+                if is_node_url:
+                    print(f"      ↳ /node/ URL detected - applying extended delay...")
+                page = await fetch_corpus_page(row['Webpage'], client, limiters, referer=URL_FDA)
+                if isinstance(page, str):
+                    await text_queue.put((idx, row, page))
+                else:
+                    await page_queue.put((idx, row, page))
+        
+        async def parser():
+            while True:
+                item = await page_queue.get()
+                if item is None:
+                    break
+                idx, row, reader = item
+                # Text extraction runs in a worker thread to keep the event loop responsive
+                await text_queue.put((idx, row, await asyncio.to_thread(reader.text)))
+        
+        async def writer():
+            while True:
+                item = await text_queue.get()
+                if item is None:
+                    break
+                idx, row, corpus_text = item
+                texts[idx - 1] = corpus_text
+                if cache is not None:
+                    cache.put(row['RAG_ID'], corpus_text)
+        
+        fetchers = [asyncio.create_task(fetcher(url_queue)) for _ in range(MAX_CONCURRENT_REQUESTS)]
+        fetchers += [asyncio.create_task(fetcher(node_url_queue)) for _ in range(MAX_CONCURRENT_NODE_REQUESTS)]
+        parsers = [asyncio.create_task(parser()) for _ in range(PARSE_WORKERS)]
+        writer_task = asyncio.create_task(writer())
+        
+        # Feed the fetchers (cached records skip the pipeline)
+        for idx, row in enumerate(rows, 1):
+            if not row['Webpage']:
+                continue
+            if cache is not None:
+                cached_text = cache.get(row['RAG_ID'])
+                if cached_text is not None:
+                    print(f"   [{idx}/{total}] ♻️ Cached: {row['Title'][:50]}...")
+                    texts[idx - 1] = cached_text
+                    continue
+            (node_url_queue if "/node/" in row['Webpage'] else url_queue).put_nowait((idx, row))
+        
+        # Shut the stages down in order, once the previous one has drained
+        for _ in range(MAX_CONCURRENT_REQUESTS):
+            url_queue.put_nowait(None)
+        for _ in range(MAX_CONCURRENT_NODE_REQUESTS):
+            node_url_queue.put_nowait(None)
+        await asyncio.gather(*fetchers)
+        for _ in parsers:
+            await page_queue.put(None)
+        await asyncio.gather(*parsers)
+        await text_queue.put(None)
+        await writer_task
+    
+    return texts
+
 # ==========================================
 # 2. MAIN PROCESS
 # ==========================================
 
-def fetch_latest_data(session):
+def fetch_latest_data(session, conditional=False):
     """
     Downloads the surface table (Metadata).
     
@@ -280,47 +862,58 @@ def fetch_latest_data(session):
     
     Args:
         session: requests.Session to reuse connections
+        conditional: If True, sends the validators of the last processed
+                     listing so an unchanged page comes back as 304
+    
+    Returns:
+        tuple: (DataFrame of records, validators dict of the response).
+               The DataFrame is None if the listing is unchanged (304)
+               and empty on errors.
     """
     print("📡 Connecting to FDA (Listing)...")
-    headers = get_browser_headers()
     
     try:
+        # Browser headers were set on the session by initialize_session
+        headers = load_listing_validators() if conditional else {}
         response = session.get(URL_FDA, headers=headers, timeout=15, allow_redirects=True)
+        
+        validators = {}
+        if response.headers.get("ETag"):
+            validators["etag"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            validators["last_modified"] = response.headers["Last-Modified"]
+        
+        if response.status_code == 304:
+            print("✅ Listing not modified since last run (HTTP 304).")
+            return None, validators
+        
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'lxml')
-        table = soup.find('table')
         
-        if not table:
+        # Stream the listing through a target parser: only the table cells are kept.
+        # The raw bytes go straight to lxml with the known encoding (no charset sniffing).
+        parser = etree.HTMLParser(target=ListingTableTarget(), encoding=LISTING_ENCODING)
+        parser.feed(response.content)
+        rows = parser.close()
+        
+        if rows is None:
             print("⚠️ No table found on main page.")
-            return pd.DataFrame()
-            
-        rows = table.find_all('tr')
+            return pd.DataFrame(), {}
+        
         data = []
         
-        for row_idx, row in enumerate(rows):
-            cols = row.find_all('td')
+        # All rows of one scrape share the same timestamp
+        scraped_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        for row_idx, cols in enumerate(rows):
             if len(cols) >= 3:
-                title = cols[0].get_text(" ", strip=True)
-                desc = cols[1].get_text(" ", strip=True)
-                date = cols[2].get_text(strip=True)
-                
-                # Robust URL extraction: search links recursively
-                link_tag = None
+                title = cell_text(cols[0])
+                desc = cell_text(cols[1])
+                date = cell_text(cols[2], separator="")
                 
-                # 1. Search directly in first column
-                link_tag = cols[0].find('a', href=True)
-                
-                # 2. If not found, search recursively
-                if not link_tag:
-                    all_links = cols[0].find_all('a', href=True, recursive=True)
-                    if all_links:
-                        link_tag = all_links[0]
-                
-                # 3. Build complete URL
-                if link_tag and link_tag.get('href'):
-                    raw_link = link_tag.get('href')
-                    raw_link = raw_link.strip()
-                    full_link = urljoin(BASE_DOMAIN, raw_link)
+                # Build complete URL from the first link of the first column
+                raw_link = cols[0]["href"]
+                if raw_link:
+                    full_link = urljoin(BASE_DOMAIN, raw_link.strip())
                 else:
                     full_link = ""
                 
@@ -335,7 +928,7 @@ def fetch_latest_data(session):
                     "Description": desc,
                     "Date": date,
                     "text": "",  # Will be filled later during deep scraping
-                    "Scraped_At": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    "Scraped_At": scraped_at
                 })
         
         print(f"✅ Found {len(data)} records in main table.")
@@ -345,35 +938,49 @@ def fetch_latest_data(session):
         if node_urls > 0:
             print(f"📊 Statistics: {node_urls} /node/... URLs found (will apply {DELAY_NODE_URL}s delay)")
         
-        return pd.DataFrame(data)
+        return pd.DataFrame(data), validators
 
     except requests.exceptions.RequestException as e:
         print(f"❌ Critical error in main table scraping: {e}")
-        return pd.DataFrame()
+        return pd.DataFrame(), {}
     except Exception as e:
         print(f"❌ Unexpected error in scraping: {e}")
-        return pd.DataFrame()
+        return pd.DataFrame(), {}
 
-def run_pipeline():
+def run_pipeline(export_excel=False):
     """
     Main pipeline function.
     Manages the complete cycle: download, comparison, and enrichment.
+    
+    Args:
+        export_excel: If True, also writes the updated master database to
+                      MASTER_DB_EXCEL_FILE for human review
     """
     logging.info("Starting FDA Watcher pipeline")
     
+    # A. Status Check (First time or update?)
+    migrate_legacy_master()
+    initial_mode = not master_db_parts()
+    
     # Create HTTP session to reuse connections
-    session = requests.Session()
+    session = create_session()
     
-    # CRITICAL: Initialize session by visiting main page
+    # CRITICAL: Initialize session by visiting main page (conditional like
+    # the listing request below, so an unchanged page is never downloaded)
     print("🔧 Initializing HTTP session...")
     logging.info("Initializing HTTP session")
-    initialize_session(session, URL_FDA)
+    initialize_session(session, URL_FDA, conditional=not initial_mode)
     
-    # A. Status Check (First time or update?)
-    initial_mode = not os.path.exists(MASTER_DB_FILE)
+    # B. Get fresh data (surface). With a master in place the request is
+    #    conditional: an unchanged listing means nothing new to process.
+    df_new, listing_validators = fetch_latest_data(session, conditional=not initial_mode)
     
-    # B. Get fresh data (surface)
-    df_new = fetch_latest_data(session)
+    if df_new is None:
+        logging.info("Listing not modified (HTTP 304): nothing to process")
+        print("\n✅ Everything synchronized. No new entries.")
+        remove_temporary_outputs()
+        session.close()
+        return {'success': False, 'message': 'No new entries'}
     
     if df_new.empty:
         print("❌ No data obtained from web.")
@@ -382,22 +989,25 @@ def run_pipeline():
 
     # C. Comparison Logic
     if not initial_mode:
-        print(f"📖 Loading Master Database from {MASTER_DB_FILE}...")
-        logging.info(f"Loading master database from {MASTER_DB_FILE}")
+        print(f"📖 Loading Master Database from {MASTER_DB_DIR}...")
+        logging.info(f"Loading master database from {MASTER_DB_DIR}")
         try:
-            df_master = pd.read_excel(MASTER_DB_FILE)
-            print(f"✅ Master Database loaded: {len(df_master)} existing records.")
-            logging.info(f"Master database loaded: {len(df_master)} existing records")
+            existing_ids = read_master_ids()
+            master_count = len(existing_ids)
+            print(f"✅ Master Database loaded: {master_count} existing records.")
+            logging.info(f"Master database loaded: {master_count} existing records")
         except Exception as e:
-            print(f"⚠️ Error reading master Excel: {e}. Starting bootstrap mode...")
-            logging.warning(f"Error reading master Excel: {e}. Starting bootstrap mode")
+            print(f"⚠️ Error reading master database: {e}. Starting bootstrap mode...")
+            logging.warning(f"Error reading master database: {e}. Starting bootstrap mode")
             initial_mode = True
-            df_master = pd.DataFrame()
+            master_count = 0
         
         if not initial_mode:
-            # Filter: Only records whose RAG_ID is NOT in Excel
-            existing_ids = set(df_master['RAG_ID'].astype(str))
-            records_to_process = df_new[~df_new['RAG_ID'].astype(str).isin(existing_ids)].copy()
+            # Filter: Only records whose RAG_ID is NOT in the master database
+            # (vectorized Arrow membership test: no per-ID Python objects;
+            #  RAG_IDs are MD5 hex strings on both sides, no conversion needed)
+            is_new = pc.invert(pc.is_in(pa.array(df_new['RAG_ID']), value_set=existing_ids))
+            records_to_process = df_new.loc[is_new.to_numpy(zero_copy_only=False)].copy()
             output_file = FILE_DELTA
             process_type = "DELTA UPDATE"
             logging.info(f"Delta update mode: {len(records_to_process)} new records to process")
@@ -409,7 +1019,7 @@ def run_pipeline():
     else:
         print("🆕 First Execution (Bootstrap) detected.")
         logging.info("First execution (bootstrap) detected")
-        df_master = pd.DataFrame()
+        master_count = 0
         records_to_process = df_new.copy()
         output_file = FILE_INITIAL
         process_type = "INITIAL LOAD"
@@ -421,14 +1031,13 @@ def run_pipeline():
     if new_count > 0:
         print(f"\n🚨 {process_type}: {new_count} new records.")
         print("📥 Starting Deep Scraping to obtain Corpus... (Please wait)\n")
-        print(f"⏱️  Note: Will apply {DELAY_STANDARD}s delay for normal URLs and {DELAY_NODE_URL}s for /node/... URLs")
-        print(f"📦 Batch strategy: {BATCH_SIZE} records per batch, {BATCH_DELAY}s pause between batches\n")
+        print(f"⏱️  Note: Will apply {DELAY_STANDARD}s delay for normal URLs and {DELAY_NODE_URL}s for /node/... URLs (per host)")
+        print(f"🔀 Concurrency: up to {MAX_CONCURRENT_REQUESTS} requests in flight ({MAX_CONCURRENT_NODE_REQUESTS} for /node/... URLs)\n")
         logging.info(f"Starting deep scraping: {new_count} records")
-        logging.info(f"Batch strategy: {BATCH_SIZE} records per batch, {BATCH_DELAY}s pause")
+        logging.info(f"Concurrency: {MAX_CONCURRENT_REQUESTS} requests ({MAX_CONCURRENT_NODE_REQUESTS} for /node/ URLs)")
         
-        # Convert DataFrame to index list for batch processing
-        indices_list = list(records_to_process.index)
-        total = len(indices_list)
+        rows = [row for _, row in records_to_process.iterrows()]
+        total = len(rows)
         
         # Statistics
         successful_scrapes = 0
@@ -440,66 +1049,52 @@ def run_pipeline():
         # Track problematic records (for review mode)
         problematic_records = []  # List of dicts with RAG_ID, Title, Webpage, Issue
         
-        # Batch processing to avoid server saturation
-        num_batches = (total + BATCH_SIZE - 1) // BATCH_SIZE  # Ceiling division
+        # Extracted text of each record, in records_to_process order
+        texts = []
         
-        for batch_num in range(num_batches):
-            batch_start = batch_num * BATCH_SIZE
-            batch_end = min(batch_start + BATCH_SIZE, total)
-            batch_indices = indices_list[batch_start:batch_end]
-            
-            print(f"\n📦 Batch {batch_num + 1}/{num_batches} ({len(batch_indices)} records)...")
-            logging.info(f"Processing batch {batch_num + 1}/{num_batches} ({len(batch_indices)} records)")
-            
-            # Process each record in the batch
-            for idx_in_batch, df_index in enumerate(batch_indices, 1):
-                global_idx = batch_start + idx_in_batch
-                row = records_to_process.loc[df_index]
+        # Scrape all records in one event loop, over one shared client
+        # (pages scraped by an interrupted earlier run come from the cache)
+        cache = ScrapeCache()
+        try:
+            corpus_texts = asyncio.run(scrape_records(rows, session.cookies, cache))
+        finally:
+            cache.close()
+        
+        # Store results and statistics for each record
+        for idx, (row, corpus_text) in enumerate(zip(rows, corpus_texts), 1):
+            if row['Webpage']:
+                is_node = "/node/" in row['Webpage']
+                texts.append(corpus_text)
                 
-                if row['Webpage']:
-                    is_node = "/node/" in row['Webpage']
-                    print(f"   [{global_idx}/{total}] Extracting: {row['Title'][:50]}...")
+                if corpus_text:
+                    successful_scrapes += 1
                     if is_node:
-                        print(f"      ↳ /node/ URL detected - applying extended delay...")
-                    
-                    corpus_text = get_full_corpus(
-                        row['Webpage'], 
-                        session, 
-                        referer=URL_FDA
-                    )
-                    records_to_process.at[df_index, 'text'] = corpus_text
-                    
-                    if corpus_text:
-                        successful_scrapes += 1
-                        if is_node:
-                            node_url_success += 1
-                    else:
-                        failed_scrapes += 1
-                        if is_node:
-                            node_url_failures += 1
-                        # Track problematic record
-                        problematic_records.append({
-                            'RAG_ID': row['RAG_ID'],
-                            'Title': row['Title'],
-                            'Webpage': row['Webpage'],
-                            'Issue': 'Empty text field (403/404 or extraction failed)'
-                        })
+                        node_url_success += 1
                 else:
-                    records_to_process.at[df_index, 'text'] = ""
                     failed_scrapes += 1
-                    print(f"   [{global_idx}/{total}] ⚠️ No URL available for: {row['Title'][:50]}...")
+                    if is_node:
+                        node_url_failures += 1
                     # Track problematic record
                     problematic_records.append({
                         'RAG_ID': row['RAG_ID'],
                         'Title': row['Title'],
-                        'Webpage': row.get('Webpage', 'N/A'),
-                        'Issue': 'No URL available'
+                        'Webpage': row['Webpage'],
+                        'Issue': 'Empty text field (403/404 or extraction failed)'
                     })
-            
-            # Pause between batches (except after last batch)
-            if batch_num < num_batches - 1:
-                print(f"\n⏸️  {BATCH_DELAY}s pause between batches to avoid server saturation...")
-                time.sleep(BATCH_DELAY)
+            else:
+                texts.append("")
+                failed_scrapes += 1
+                print(f"   [{idx}/{total}] ⚠️ No URL available for: {row['Title'][:50]}...")
+                # Track problematic record
+                problematic_records.append({
+                    'RAG_ID': row['RAG_ID'],
+                    'Title': row['Title'],
+                    'Webpage': row.get('Webpage', 'N/A'),
+                    'Issue': 'No URL available'
+                })
+        
+        # Single column assignment instead of one .at write per record
+        records_to_process['text'] = texts
         
         elapsed_time = time.time() - start_time
         
@@ -515,7 +1110,6 @@ def run_pipeline():
             node_success_rate = (node_url_success / total_node_urls * 100) if total_node_urls > 0 else 0
             print(f"   📌 /node/... URLs: {node_url_success} successful, {node_url_failures} failed ({node_success_rate:.1f}% success)")
         print(f"   ⏱️  Total time: {elapsed_time:.1f}s ({elapsed_time/60:.1f} minutes)")
-        print(f"   📦 Batches processed: {num_batches}")
         print(f"{'='*60}\n")
         
         # Logging summary
@@ -534,27 +1128,31 @@ def run_pipeline():
             logging.info(f"/node/... URLs failed: {node_url_failures}")
             logging.info(f"/node/... URLs success rate: {node_success_rate:.1f}%")
         logging.info(f"Total time: {elapsed_time:.1f}s ({elapsed_time/60:.1f} minutes)")
-        logging.info(f"Batches processed: {num_batches}")
         logging.info(f"Generated JSON file: {output_file}")
         if problematic_records:
             logging.warning(f"Problematic records: {len(problematic_records)}")
         logging.info("-" * 80)
         
         # 1. Save JSON for RAG
-        records_to_process.to_json(output_file, orient="records", indent=4)
+        save_records_json(records_to_process, output_file)
         print(f"📦 JSON Ready for RAG: {output_file}")
         logging.info(f"JSON file saved: {output_file}")
         
-        # 2. Update Master Excel
-        if initial_mode:
-            df_updated = records_to_process
-        else:
-            # Put new entries at the beginning
-            df_updated = pd.concat([records_to_process, df_master], ignore_index=True)
-            
-        df_updated.to_excel(MASTER_DB_FILE, index=False)
-        print(f"💾 Master Database Updated: {MASTER_DB_FILE} ({len(df_updated)} total records)")
-        logging.info(f"Master database updated: {MASTER_DB_FILE} ({len(df_updated)} total records)")
+        # 2. Update Master Database: append the new records as a new part
+        #    (initial load replaces any unreadable leftovers)
+        write_master_part(records_to_process, replace=initial_mode)
+        total_records = len(records_to_process) + master_count
+        print(f"💾 Master Database Updated: {MASTER_DB_DIR} ({total_records} total records)")
+        logging.info(f"Master database updated: {MASTER_DB_DIR} ({total_records} total records)")
+        
+        # 3. Optional Excel copy for human review (new entries at the beginning)
+        if export_excel:
+            read_master_db(newest_first=True).to_excel(MASTER_DB_EXCEL_FILE, index=False)
+            print(f"📊 Excel export: {MASTER_DB_EXCEL_FILE}")
+            logging.info(f"Excel export written: {MASTER_DB_EXCEL_FILE}")
+        
+        # 4. Listing fully processed: later runs can ask for it conditionally
+        save_listing_validators(listing_validators)
         
         # Prepare statistics to return
         scraping_stats = {
@@ -567,7 +1165,6 @@ def run_pipeline():
             'node_urls_successful': node_url_success,
             'node_urls_failed': node_url_failures,
             'total_time': elapsed_time,
-            'batches_processed': num_batches,
             'json_file': output_file,
             'problematic_records': problematic_records  # List of records with issues
         }
@@ -579,11 +1176,9 @@ def run_pipeline():
         print("\n✅ Everything synchronized. No new entries.")
         # IMPORTANT: Only clean temporary files if NOT first execution
         if not initial_mode:
-            for f in [FILE_INITIAL, FILE_DELTA]:
-                if os.path.exists(f):
-                    os.remove(f)
-                    print(f"🗑️ Temporary file deleted: {f}")
+            remove_temporary_outputs()
         
+        save_listing_validators(listing_validators)
         session.close()
         return {'success': False, 'message': 'No new entries'}
 
@@ -594,7 +1189,22 @@ if __name__ == "__main__":
     
     Usage:
         python scripts/fda_watcher.py
+        python scripts/fda_watcher.py --export-excel
     """
+    parser = argparse.ArgumentParser(
+        description='FDA Watcher - Scrapes new FDA oncology approvals for RAG'
+    )
+    parser.add_argument(
+        '--export-excel',
+        action='store_true',
+        help=f'Also export the master database to {MASTER_DB_EXCEL_FILE} for review'
+    )
+    args = parser.parse_args()
+    
+    # libuv-based event loop for the async scraper (default asyncio loop otherwise)
+    if UVLOOP_AVAILABLE:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    
     print("="*80)
     print("🚀 FDA WATCHER - Step 1: Scraping")
     print("="*80)
@@ -603,7 +1213,7 @@ if __name__ == "__main__":
     logging.info("="*80)
     
     try:
-        result = run_pipeline()
+        result = run_pipeline(export_excel=args.export_excel)
         
         if isinstance(result, dict) and result.get('success'):
             print(f"\n✅ Scraping completed successfully!")
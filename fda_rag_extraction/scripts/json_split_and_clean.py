@@ -6,11 +6,215 @@ and splits each case into individual JSON files with cleaned Corpus field.
 """
 
 import json
+import mmap
 import os
 import sys
 import hashlib
 import re
 import logging
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+
+# CUTOFF POINTS: Lines that mark the end of useful content
+# When found, remove this line AND everything after it
+# (searched anywhere in the line, so no leading/trailing ".*" is needed)
+CUTOFF_PATTERNS = [
+    # Assessment Aid - marks end of content
+    r"This review.*used.*Assessment Aid",
+    r"This review was conducted.*Assessment Aid",
+    
+    # RTOR (Real-Time Oncology Review) - marks end of content
+    r"This review used.*Real-Time Oncology Review",
+    r"This review used.*RTOR",
+    
+    # Project Orbis - marks end of content
+    r"This review was conducted under Project Orbis",
+    
+    # Priority review / Breakthrough / Orphan designation - marks end of content
+    r"The application was granted.*priority review",
+    r"The application was granted.*breakthrough",
+    r"The application was granted.*orphan",
+    r"granted.*priority review",
+    r"granted.*breakthrough designation",
+    r"granted.*orphan drug designation",
+    r"received.*orphan drug designation",
+    r"received.*breakthrough designation",
+    r"received.*priority review",
+]
+
+# Literal screen for the cutoff regex: every CUTOFF_PATTERNS entry contains one
+# of these words, so lines without any of them (almost all) skip the regex.
+# Keep in sync when adding cutoff patterns.
+CUTOFF_LITERALS = ("this review", "granted", "received")
+
+# re.IGNORECASE also matches these to "i"; str.casefold() does not
+CASEFOLD_FIXUPS = str.maketrans({'\u0130': 'i', '\u0131': 'i'})
+
+# Single-line patterns to remove (boilerplate lines)
+# IMPORTANT: These patterns only match lines that START with the pattern
+# This ensures we don't accidentally remove content that contains these phrases
+REMOVE_PATTERNS = [
+    # Social media / follow lines (multiple variations)
+    r"^Follow the Oncology Center of Excellence.*",
+    r"^Follow the Oncology Center of Excellence on X.*",
+    r"^Follow the Oncology Center of Excellence on X \(formerly Twitter\).*",
+    r"^Follow the Oncology Center of Excellence on Twitter.*",
+    r"^Follow us on X.*",
+    
+    # Adverse event reporting
+    r"^Healthcare professionals should report all serious adverse events.*",
+    
+    # Prescribing information - ONLY lines that START with these exact phrases
+    # This ensures we don't remove dosage information like "Less than 50 kg: 120 mg..."
+    r"^Full prescribing information for\s+.*",
+    r"^View full prescribing information for\s+.*",
+    r"^See full prescribing information for\s+.*",
+    
+    # Project Facilitate / IND assistance
+    r"^For assistance with single-patient INDs for investigational oncology products.*",
+    
+    # Expedited programs / Guidance for Industry
+    r"^FDA expedited programs are described in the Guidance for Industry.*",
+    r"^A description of FDA expedited programs is in the Guidance.*",
+    r"^FDA expedited programs are described in the Guidance.*",
+    
+    # COVID-19 / Coronavirus references
+    r"^For information on the COVID-19 pandemic.*",
+    r"^FDA: Coronavirus Disease 2019 \(COVID-19\).*",
+    r"^CDC: Coronavirus \(COVID-19\).*",
+]
+
+# Literal screen for the boilerplate regex: every REMOVE_PATTERNS entry starts
+# with one of these (casefolded) prefixes, so other lines skip the regex.
+# Keep in sync when adding boilerplate patterns.
+REMOVE_PREFIXES = tuple(prefix.casefold() for prefix in (
+    "Follow the Oncology",
+    "Follow us on X",
+    "Healthcare professionals should report",
+    "Full prescribing information for",
+    "View full prescribing information for",
+    "See full prescribing information for",
+    "For assistance with single-patient INDs",
+    "FDA expedited programs are described",
+    "A description of FDA expedited",
+    "For information on the COVID-19",
+    "FDA: Coronavirus",
+    "CDC: Coronavirus",
+))
+
+# Dosage information: lines with weight/dose information are never treated as boilerplate
+# (searched anywhere in the line, so no leading/trailing ".*" is needed)
+DOSAGE_PATTERNS = [
+    r'\d\s*(?:kg|mg|g|mcg)',  # Contains weight or dose units
+    r'less than.*\d',  # "Less than X"
+    r'greater than.*\d',  # "Greater than X"
+    r'\d\s*(?:or|and)\s*(?:greater|less)',  # "X or greater"
+    r'orally.*twice.*daily',  # Dosage frequency
+    r'orally.*once.*daily',
+    r'mg.*orally',
+]
+
+# Headers to remove if they appear as standalone lines
+HEADERS_TO_REMOVE = frozenset([
+    "Efficacy and Safety",
+    "Recommended Dosage",
+    "Expedited Programs",
+])
+
+
+def casefold_line(line):
+    """Casefolds a line the way re.IGNORECASE compares it."""
+    return (line if line.isascii() else line.translate(CASEFOLD_FIXUPS)).casefold()
+
+def has_cutoff_literal(line):
+    """
+    Cheap case-insensitive screen: True if the line contains one of
+    CUTOFF_LITERALS (a necessary condition for matching CUTOFF_ANY).
+    """
+    folded = casefold_line(line)
+    return any(literal in folded for literal in CUTOFF_LITERALS)
+
+def has_remove_prefix(line):
+    """
+    Cheap case-insensitive screen: True if the line starts with one of
+    REMOVE_PREFIXES (a necessary condition for matching REMOVE_ANY).
+    """
+    return casefold_line(line).startswith(REMOVE_PREFIXES)
+
+def compile_any(patterns):
+    """
+    Compiles a pattern list into a single case-insensitive alternation,
+    so each line is scanned once instead of once per pattern.
+    """
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+
+# Compiled once at import time
+CUTOFF_ANY = compile_any(CUTOFF_PATTERNS)
+REMOVE_ANY = compile_any(REMOVE_PATTERNS)
+DOSAGE_ANY = compile_any(DOSAGE_PATTERNS)
+
+# Line classes returned by classify_line (bit flags)
+LINE_CUTOFF = 1  # Matches a cutoff pattern
+LINE_DROP = 2  # Boilerplate line or standalone header
+
+
+@functools.lru_cache(maxsize=8192)
+def classify_line(line_stripped):
+    """
+    Classifies a stripped, non-empty line against the cutoff, boilerplate
+    and header rules (LINE_CUTOFF / LINE_DROP flags, 0 = plain content).
+    
+    Memoized at module level: FDA boilerplate recurs verbatim across
+    pages, so within one split_and_clean run each distinct line is
+    matched once.
+    """
+    flags = 0
+    if has_cutoff_literal(line_stripped) and CUTOFF_ANY.search(line_stripped):
+        flags |= LINE_CUTOFF
+    # CONSERVATIVE: Only remove lines that START with the pattern (not lines that contain it)
+    # (every pattern is anchored with "^", and re.match checks start of string)
+    if line_stripped in HEADERS_TO_REMOVE or (
+        has_remove_prefix(line_stripped) and REMOVE_ANY.match(line_stripped)
+    ):
+        flags |= LINE_DROP
+    return flags
+
+# Unicode normalization of the cleaned text
+UNICODE_TABLE = str.maketrans({
+    # Dashes
+    '\u2013': '-',  # en dash
+    '\u2014': '-',  # em dash
+    '\u2212': '-',  # minus sign
+    # Quotes
+    '\u2018': "'",  # left single quote
+    '\u2019': "'",  # right single quote
+    '\u201C': '"',  # left double quote
+    '\u201D': '"',  # right double quote
+})
+
+# Whitespace normalization of the cleaned text
+RE_SPACES = re.compile(r' +')
+RE_NEWLINES = re.compile(r'\n{3,}')
+
+# Smaller inputs are processed sequentially (process start-up would dominate)
+MIN_PARALLEL_RECORDS = 64
+
+# Number of records handed to each worker process at a time
+WORKER_CHUNKSIZE = 32
 
 
 def clean_corpus(corpus_text):
@@ -29,85 +233,27 @@ def clean_corpus(corpus_text):
     if not corpus_text:
         return ""
     
-    lines = corpus_text.split('\n')
+    # Lines are stripped once; every later check reuses the stripped text
+    stripped = [line.strip() for line in corpus_text.split('\n')]
+    total_lines = len(stripped)
     cleaned_lines = []
     
-    # CUTOFF POINTS: Lines that mark the end of useful content
-    # When found, remove this line AND everything after it
-    cutoff_patterns = [
-        # Assessment Aid - marks end of content
-        r".*This review.*used.*Assessment Aid.*",
-        r".*This review was conducted.*Assessment Aid.*",
-        
-        # RTOR (Real-Time Oncology Review) - marks end of content
-        r".*This review used.*Real-Time Oncology Review.*",
-        r".*This review used.*RTOR.*",
-        
-        # Project Orbis - marks end of content
-        r".*This review was conducted under Project Orbis.*",
-        
-        # Priority review / Breakthrough / Orphan designation - marks end of content
-        r".*The application was granted.*priority review.*",
-        r".*The application was granted.*breakthrough.*",
-        r".*The application was granted.*orphan.*",
-        r".*granted.*priority review.*",
-        r".*granted.*breakthrough designation.*",
-        r".*granted.*orphan drug designation.*",
-        r".*received.*orphan drug designation.*",
-        r".*received.*breakthrough designation.*",
-        r".*received.*priority review.*",
-    ]
-    
-    # Single-line patterns to remove (boilerplate lines)
-    # IMPORTANT: These patterns only match lines that START with the pattern
-    # This ensures we don't accidentally remove content that contains these phrases
-    patterns_to_remove = [
-        # Social media / follow lines (multiple variations)
-        r"^Follow the Oncology Center of Excellence.*",
-        r"^Follow the Oncology Center of Excellence on X.*",
-        r"^Follow the Oncology Center of Excellence on X \(formerly Twitter\).*",
-        r"^Follow the Oncology Center of Excellence on Twitter.*",
-        r"^Follow us on X.*",
-        
-        # Adverse event reporting
-        r"^Healthcare professionals should report all serious adverse events.*",
-        
-        # Prescribing information - ONLY lines that START with these exact phrases
-        # This ensures we don't remove dosage information like "Less than 50 kg: 120 mg..."
-        r"^Full prescribing information for\s+.*",
-        r"^View full prescribing information for\s+.*",
-        r"^See full prescribing information for\s+.*",
-        
-        # Project Facilitate / IND assistance
-        r"^For assistance with single-patient INDs for investigational oncology products.*",
-        
-        # Expedited programs / Guidance for Industry
-        r"^FDA expedited programs are described in the Guidance for Industry.*",
-        r"^A description of FDA expedited programs is in the Guidance.*",
-        r"^FDA expedited programs are described in the Guidance.*",
-        
-        # COVID-19 / Coronavirus references
-        r"^For information on the COVID-19 pandemic.*",
-        r"^FDA: Coronavirus Disease 2019 \(COVID-19\).*",
-        r"^CDC: Coronavirus \(COVID-19\).*",
-    ]
-    
-    # Headers to remove if repeated
-    headers_to_remove = [
-        "Efficacy and Safety",
-        "Recommended Dosage",
-        "Expedited Programs",
-    ]
+    # IMPORTANT: Dosage patterns: lines that contain weight/dose information.
+    # Only needed by the cutoff lookahead, so each line is searched on first
+    # use and remembered (overlapping lookahead windows never search twice).
+    dosage_flags = {}
+    
+    def is_dosage(line_idx):
+        flag = dosage_flags.get(line_idx)
+        if flag is None:
+            line = stripped[line_idx]
+            flag = dosage_flags[line_idx] = bool(line) and DOSAGE_ANY.search(line) is not None
+        return flag
     
     # Track context to preserve important information
-    # Look ahead buffer to check if important content follows
-    lookahead_buffer = []
     MAX_LOOKAHEAD = 5  # Check next 5 lines for important content
     
-    for idx, line in enumerate(lines):
-        original_line = line
-        line_stripped = line.strip()
-        
+    for idx, line_stripped in enumerate(stripped):
         # Skip empty lines (but preserve structure)
         if not line_stripped:
             # Only skip if we're not in the middle of important content
@@ -117,101 +263,47 @@ def clean_corpus(corpus_text):
                 cleaned_lines.append('')
             continue
         
-        # IMPORTANT: Check if this line contains dosage information BEFORE applying any filters
-        # Dosage patterns: lines that contain weight/dose information
-        is_dosage_info = False
-        dosage_patterns = [
-            r'.*\d+\s*(kg|mg|g|mcg).*',  # Contains weight or dose units
-            r'.*less than.*\d+.*',  # "Less than X"
-            r'.*greater than.*\d+.*',  # "Greater than X"
-            r'.*\d+\s*(or|and)\s*(greater|less).*',  # "X or greater"
-            r'.*orally.*twice.*daily.*',  # Dosage frequency
-            r'.*orally.*once.*daily.*',
-            r'.*mg.*orally.*',
-        ]
-        
-        for dosage_pattern in dosage_patterns:
-            if re.search(dosage_pattern, line_stripped, re.IGNORECASE):
-                is_dosage_info = True
-                break
-        
         # Check for CUTOFF POINTS FIRST - before adding to cleaned_lines
         # This ensures cutoff lines are not added even if they're not at the end
         # CRITICAL: Always check if important content follows before cutting off
+        line_class = classify_line(line_stripped)
         is_cutoff = False
-        for cutoff_pattern in cutoff_patterns:
-            if re.search(cutoff_pattern, line_stripped, re.IGNORECASE):
-                # CRITICAL: Before cutting off, ALWAYS check if there's important content following
-                # Look ahead to see if there's dosage info or other important content coming
-                has_important_followup = False
-                
-                # Check if previous line suggests important content (ends with ":")
-                previous_suggests_list = cleaned_lines and cleaned_lines[-1].endswith(':')
-                
-                # Look ahead in next lines for dosage information
-                # IMPORTANT: Increase lookahead range and don't skip empty lines too aggressively
-                # Real pages may have many empty lines between content
-                extended_lookahead = MAX_LOOKAHEAD * 3  # Look further ahead (15 lines instead of 5)
-                
-                for lookahead_idx in range(idx + 1, min(idx + extended_lookahead + 1, len(lines))):
-                    lookahead_line = lines[lookahead_idx].strip()
-                    if not lookahead_line:
-                        # Don't skip empty lines - continue checking (they might be between content)
-                        continue
-                    
-                    # Check if lookahead contains dosage info
-                    for dosage_pattern in dosage_patterns:
-                        if re.search(dosage_pattern, lookahead_line, re.IGNORECASE):
-                            has_important_followup = True
-                            break
-                    if has_important_followup:
-                        break
-                    
-                    # Also check if lookahead line ends with ":" (might introduce a list)
-                    if lookahead_line.endswith(':'):
-                        # Check further ahead for dosage info (with extended range)
-                        for further_idx in range(lookahead_idx + 1, min(lookahead_idx + extended_lookahead + 1, len(lines))):
-                            further_line = lines[further_idx].strip()
-                            if not further_line:
-                                continue
-                            for dosage_pattern in dosage_patterns:
-                                if re.search(dosage_pattern, further_line, re.IGNORECASE):
-                                    has_important_followup = True
-                                    break
-                            if has_important_followup:
-                                break
-                        if has_important_followup:
-                            break
-                
-                # If important content follows, don't cut off yet - just skip this cutoff line
-                if has_important_followup or previous_suggests_list:
-                    # Still remove this cutoff line (don't add it), but continue processing to preserve important content
-                    # This ensures we remove the boilerplate but keep the important dosage info that follows
-                    continue
-                
-                is_cutoff = True
-                break
+        if line_class & LINE_CUTOFF:
+            # CRITICAL: Before cutting off, ALWAYS check if there's important content following
+            # Look ahead to see if there's dosage info or other important content coming
+            
+            # Check if previous line suggests important content (ends with ":")
+            previous_suggests_list = cleaned_lines and cleaned_lines[-1].endswith(':')
+            
+            # Look ahead in next lines for dosage information
+            # IMPORTANT: Increase lookahead range and don't skip empty lines too aggressively
+            # Real pages may have many empty lines between content
+            extended_lookahead = MAX_LOOKAHEAD * 3  # Look further ahead (15 lines instead of 5)
+            
+            # A following line has dosage info, or ends with ":" (might introduce
+            # a list) and is itself followed by dosage info (with extended range).
+            # Empty lines are neither dosage nor ":" lines, so they are skipped.
+            has_important_followup = any(
+                is_dosage(lookahead_idx) or (
+                    stripped[lookahead_idx].endswith(':')
+                    and any(map(is_dosage, range(lookahead_idx + 1, min(lookahead_idx + extended_lookahead + 1, total_lines))))
+                )
+                for lookahead_idx in range(idx + 1, min(idx + extended_lookahead + 1, total_lines))
+            )
+            
+            # If important content follows, don't cut off yet: the cutoff line goes
+            # through the remaining filters and processing continues, so the
+            # important dosage info that follows is preserved
+            is_cutoff = not (has_important_followup or previous_suggests_list)
         
         if is_cutoff:
             # Stop processing - everything from this line onwards is boilerplate
             break
         
-        # Check if line matches single-line patterns to remove
-        # CONSERVATIVE: Only remove lines that START with the pattern (not lines that contain it)
-        # This ensures we preserve important content like dosage information
-        should_skip = False
-        for pattern in patterns_to_remove:
-            # Only match if line STARTS with pattern (re.match checks start of string)
-            if re.match(pattern, line_stripped, re.IGNORECASE):
-                should_skip = True
-                break
-        
-        if should_skip:
-            continue
-        
-        # Skip repeated headers (remove if they appear as standalone lines)
-        if line_stripped in headers_to_remove:
-            # Skip this header entirely if it appears as a standalone line
+        # Skip lines matching single-line patterns to remove and repeated
+        # headers (standalone lines). Only lines that START with a pattern are
+        # removed, which preserves important content like dosage information
+        if line_class & LINE_DROP:
             continue
         
         cleaned_lines.append(line_stripped)
@@ -219,23 +311,14 @@ def clean_corpus(corpus_text):
     # Join lines back
     cleaned_text = '\n'.join(cleaned_lines)
     
-    # Normalize Unicode characters
-    # Normalize dashes
-    cleaned_text = cleaned_text.replace('\u2013', '-')  # en dash
-    cleaned_text = cleaned_text.replace('\u2014', '-')  # em dash
-    cleaned_text = cleaned_text.replace('\u2212', '-')  # minus sign
-    
-    # Normalize quotes
-    cleaned_text = cleaned_text.replace('\u2018', "'")  # left single quote
-    cleaned_text = cleaned_text.replace('\u2019', "'")  # right single quote
-    cleaned_text = cleaned_text.replace('\u201C', '"')  # left double quote
-    cleaned_text = cleaned_text.replace('\u201D', '"')  # right double quote
+    # Normalize Unicode characters (dashes and quotes) in a single pass
+    cleaned_text = cleaned_text.translate(UNICODE_TABLE)
     
     # Clean multiple whitespace (but preserve single newlines between paragraphs)
     # Replace multiple spaces with single space
-    cleaned_text = re.sub(r' +', ' ', cleaned_text)
+    cleaned_text = RE_SPACES.sub(' ', cleaned_text)
     # Replace multiple newlines (3+) with double newline
-    cleaned_text = re.sub(r'\n{3,}', '\n\n', cleaned_text)
+    cleaned_text = RE_NEWLINES.sub('\n\n', cleaned_text)
     
     # Final strip
     cleaned_text = cleaned_text.strip()
@@ -254,77 +337,177 @@ logging.basicConfig(
     filemode='a'  # Append mode
 )
 
-def split_and_clean(input_json_path: str, out_dir: str = "data/processed-json"):
+# Output directories opened once per process (O_DIRECTORY fds): case files
+# are created relative to them, so the kernel does not resolve the full
+# path again for every file. Closed by split_and_clean when it is done.
+_out_dir_fds = {}
+
+def write_case_file(out_dir, file_name, payload):
+    """
+    Writes one case file (bytes) into out_dir.
+    Uses a cached directory fd where os.open supports dir_fd (POSIX),
+    and a plain path elsewhere (Windows).
+    """
+    if os.open not in os.supports_dir_fd:
+        with open(os.path.join(out_dir, file_name), 'wb') as f:
+            f.write(payload)
+        return
+    
+    dir_fd = _out_dir_fds.get(out_dir)
+    if dir_fd is None:
+        dir_fd = _out_dir_fds[out_dir] = os.open(out_dir, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+    
+    def opener(path, flags):
+        # Same permissions as open() (0o666, minus umask)
+        return os.open(path, flags, 0o666, dir_fd=dir_fd)
+    
+    with open(file_name, 'wb', opener=opener) as f:
+        f.write(payload)
+
+def close_out_dirs():
+    """Closes the directory fds opened by write_case_file in this process."""
+    while _out_dir_fds:
+        os.close(_out_dir_fds.popitem()[1])
+
+def hash_corpus(corpus_clean, hash_algorithm="md5"):
+    """
+    Returns the hex digest identifying a cleaned Corpus.
+    
+    Args:
+        corpus_clean: Cleaned Corpus text
+        hash_algorithm: "md5" (default, matches hashes of earlier runs) or
+                        "xxh3_128" (much faster on long corpora, needs xxhash)
+    """
+    corpus_bytes = corpus_clean.encode('utf-8')
+    if hash_algorithm == "md5":
+        # A change-detection key, not a security use: lets OpenSSL skip
+        # its FIPS-restricted MD5 path
+        return hashlib.md5(corpus_bytes, usedforsecurity=False).hexdigest()
+    if hash_algorithm == "xxh3_128":
+        return xxhash.xxh3_128_hexdigest(corpus_bytes)
+    raise ValueError(f"Unsupported hash algorithm: {hash_algorithm}")
+
+def process_case(item, write=True, out_dir="data/processed-json", hash_algorithm="md5"):
+    """
+    Cleans one case and saves it as an individual JSON file.
+    Runs in the worker processes of split_and_clean (must stay top-level).
+    
+    Args:
+        item: Record from the watcher JSON
+        write: If False, only the result is computed (the file is written
+               by a later record with the same RAG_ID)
+        out_dir: Output directory for individual case files
+        hash_algorithm: Algorithm of corpus_hash (see hash_corpus)
+    
+    Returns:
+        Result dictionary (RAG_ID, file, corpus_hash), or None if the
+        record has no RAG_ID
+    """
+    # Get RAG_ID
+    rag_id = item.get('RAG_ID')
+    if not rag_id:
+        return None
+    
+    # Get original text (from watcher, field is called "text")
+    text = item.get('text', '')
+    
+    # Clean the text
+    corpus_clean = clean_corpus(text)
+    
+    # Create a clean copy of the item for output
+    # Remove Scraped_At and text, add cleaned Corpus
+    output_item = item.copy()
+    
+    # Remove Scraped_At field
+    if 'Scraped_At' in output_item:
+        del output_item['Scraped_At']
+    
+    # Remove original text field (raw scraped content)
+    if 'text' in output_item:
+        del output_item['text']
+    
+    # Add cleaned Corpus (processed content ready for use)
+    output_item['Corpus'] = corpus_clean
+    
+    # Calculate hash of cleaned Corpus
+    corpus_hash = hash_corpus(corpus_clean, hash_algorithm)
+    
+    # Create output file path
+    output_file = os.path.join(out_dir, f"{rag_id}.json")
+    
+    # Save individual case file (orjson writes UTF-8 bytes directly,
+    # same layout as json.dump with indent=2 and ensure_ascii=False)
+    if write:
+        if ORJSON_AVAILABLE:
+            payload = orjson.dumps(output_item, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(output_item, indent=2, ensure_ascii=False).encode('utf-8')
+        write_case_file(out_dir, f"{rag_id}.json", payload)
+    
+    return {
+        'RAG_ID': rag_id,
+        'file': output_file,
+        'corpus_hash': corpus_hash
+    }
+
+def split_and_clean(input_json_path: str, out_dir: str = "data/processed-json", max_workers: int = None,
+                    hash_algorithm: str = "md5"):
     """
     Main function to split and clean JSON data.
     
     Args:
         input_json_path: Path to the input JSON file (from watcher)
         out_dir: Output directory for individual case files (default: "data/processed-json")
+        max_workers: Number of worker processes (default: CPU count, 1 = sequential)
+        hash_algorithm: Algorithm of corpus_hash: "md5" (default) or "xxh3_128"
+                        (opt-in; hashes are not comparable with MD5 ones)
     
     Returns:
         List of dictionaries with:
         - RAG_ID: The unique identifier
         - file: Path to the individual JSON file
-        - corpus_hash: MD5 hash of the cleaned Corpus field
+        - corpus_hash: Hash (MD5 by default) of the cleaned Corpus field
     """
+    if hash_algorithm not in ("md5", "xxh3_128"):
+        raise ValueError(f"Unsupported hash algorithm: {hash_algorithm}")
+    if hash_algorithm == "xxh3_128" and not XXHASH_AVAILABLE:
+        raise ImportError("hash_algorithm='xxh3_128' requires the xxhash package")
+    
     logging.info(f"Starting split_and_clean: input={input_json_path}, output={out_dir}")
     
     # Create output directory if it doesn't exist
     os.makedirs(out_dir, exist_ok=True)
     
-    # Read input JSON
-    with open(input_json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # Read input JSON. orjson parses straight from a memory map of the file
+    # (no intermediate bytes copy next to the parsed records)
+    with open(input_json_path, 'rb') as f:
+        if ORJSON_AVAILABLE and os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    data = orjson.loads(view)
+        else:
+            raw = f.read()
+            data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
     
     logging.info(f"Loaded {len(data)} records from {input_json_path}")
     
-    # Process each case
-    results = []
+    # Only the last record of a repeated RAG_ID writes its case file (as the
+    # sequential loop left it), so two workers never write the same file
+    last_index = {item.get('RAG_ID'): idx for idx, item in enumerate(data)}
+    write_flags = [last_index[item.get('RAG_ID')] == idx for idx, item in enumerate(data)]
     
-    for item in data:
-        # Get RAG_ID
-        rag_id = item.get('RAG_ID')
-        if not rag_id:
-            continue
-        
-        # Get original text (from watcher, field is called "text")
-        text = item.get('text', '')
-        
-        # Clean the text
-        corpus_clean = clean_corpus(text)
-        
-        # Create a clean copy of the item for output
-        # Remove Scraped_At and text, add cleaned Corpus
-        output_item = item.copy()
-        
-        # Remove Scraped_At field
-        if 'Scraped_At' in output_item:
-            del output_item['Scraped_At']
-        
-        # Remove original text field (raw scraped content)
-        if 'text' in output_item:
-            del output_item['text']
-        
-        # Add cleaned Corpus (processed content ready for use)
-        output_item['Corpus'] = corpus_clean
-        
-        # Calculate MD5 hash of cleaned Corpus
-        corpus_hash = hashlib.md5(corpus_clean.encode('utf-8')).hexdigest()
-        
-        # Create output file path
-        output_file = os.path.join(out_dir, f"{rag_id}.json")
-        
-        # Save individual case file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(output_item, f, indent=2, ensure_ascii=False)
-        
-        # Add to results
-        results.append({
-            'RAG_ID': rag_id,
-            'file': output_file,
-            'corpus_hash': corpus_hash
-        })
+    # Process each case (in worker processes when there are enough of them)
+    workers = max_workers or os.cpu_count() or 1
+    worker = partial(process_case, out_dir=out_dir, hash_algorithm=hash_algorithm)
+    if workers > 1 and len(data) >= MIN_PARALLEL_RECORDS:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            processed = list(executor.map(worker, data, write_flags, chunksize=WORKER_CHUNKSIZE))
+    else:
+        try:
+            processed = list(map(worker, data, write_flags))
+        finally:
+            close_out_dirs()
+    results = [result for result in processed if result is not None]
     
     logging.info(f"Successfully processed {len(results)} cases")
     logging.info(f"Output directory: {out_dir}")
@@ -7,16 +7,16 @@ It doesn't do the heavy lifting; it just waits for the time and wakes up the Man
 To stop it: Press Ctrl + C in the terminal.
 """
 
-import schedule
 import time
 import logging
 import os
 import sys
 import subprocess
-from datetime import datetime 
+from datetime import datetime, timedelta
 
 # --- CONFIGURATION ---
 EXECUTION_TIME = "09:00"  # Local time on your Mac (24h format)
+MAX_SLEEP = 3600  # Longest single sleep (seconds): re-checks the wall clock after DST changes or system sleep
 
 # Create logs directory if it doesn't exist
 os.makedirs('logs', exist_ok=True)
@@ -30,15 +30,20 @@ logging.basicConfig(
 )
 
 def execute_step(script_path, *args):
-    """Execute a Python script and return success status"""
+    """
+    Execute a Python script and return success status.
+    
+    The script runs in its own process (own logging, working directory and
+    memory for each daily run) and its output is streamed to this terminal
+    as it runs instead of being buffered until it exits.
+    """
     try:
         cmd = [sys.executable, script_path] + list(args)
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(__file__)))
+        result = subprocess.run(cmd, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         if result.returncode == 0:
-            print(result.stdout)
             return True
         else:
-            print(f"❌ Error: {result.stderr}")
+            print(f"❌ Error: {os.path.basename(script_path)} exited with code {result.returncode}")
             return False
     except Exception as e:
         print(f"❌ Failed to execute {script_path}: {e}")
@@ -56,7 +61,7 @@ def scheduled_task():
     print(f"\n⏰ RING RING! It's time ({EXECUTION_TIME}). Starting Step 1 (FDA Watcher)...")
     logging.info(f"Starting scheduled execution at {EXECUTION_TIME}")
     
-    scripts_dir = os.path.dirname(__file__)
+    scripts_dir = os.path.dirname(os.path.abspath(__file__))
     
     try:
         # Step 1: Scraping (ONLY STEP - requires manual review)
@@ -99,6 +104,27 @@ def scheduled_task():
         print(f"❌ Step 1 failed: {e}")
         logging.error(f"Error executing Step 1: {e}", exc_info=True)
 
+def next_run_time(now=None):
+    """Returns the next datetime at EXECUTION_TIME (today if still ahead, else tomorrow)."""
+    now = now or datetime.now()
+    hour, minute = map(int, EXECUTION_TIME.split(":"))
+    next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if next_run <= now:
+        next_run += timedelta(days=1)
+    return next_run
+
+def wait_until(next_run):
+    """
+    Blocks until the given datetime.
+    Sleeps for the whole remaining time (at most MAX_SLEEP at once) instead
+    of polling, so the process stays idle between runs.
+    """
+    while True:
+        remaining = (next_run - datetime.now()).total_seconds()
+        if remaining <= 0:
+            return
+        time.sleep(min(remaining, MAX_SLEEP))
+
 def start_clock():
     print("="*60)
     print(f"⏳ AUTOMATION STARTED (Scheduler Mode)")
@@ -112,15 +138,13 @@ def start_clock():
     print(f"🛑 To exit: Ctrl + C")
     print("="*60)
 
-    # Schedule the daily task
-    schedule.every().day.at(EXECUTION_TIME).do(scheduled_task)
-    
     # Infinite Loop (The heart that keeps the script alive)
     while True:
-        # Check if it's time
-        schedule.run_pending()
-        # Sleep 1 minute to avoid wasting CPU on your Mac checking every millisecond
-        time.sleep(60)
+        # Sleep until it's time for the daily task
+        next_run = next_run_time()
+        logging.info(f"Next execution scheduled at {next_run:%Y-%m-%d %H:%M}")
+        wait_until(next_run)
+        scheduled_task()
 
 if __name__ == "__main__":
     start_clock()
\ No newline at end of file
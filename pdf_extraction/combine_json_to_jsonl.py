@@ -10,13 +10,22 @@ License: MIT
 """
 
 import json
+import os
 import re
 from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass
-from typing import Iterator, Dict, Any
+from typing import Iterator, Dict, Any, List, Union
+from queue import Queue
+from threading import Thread
 import argparse
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 # =============================================================================
 # Configuration
@@ -28,6 +37,8 @@ class ConverterConfig:
     input_dir: Path = Path("data/processed")
     output_dir: Path = Path("Output")
     source_name: str = "pdf_extraction"
+    write_buffer_size: int = 1 << 20  # JSONL output buffer (1 MiB)
+    read_queue_size: int = 64  # Parsed files buffered ahead of the writer
     
     def __post_init__(self):
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -37,9 +48,16 @@ class ConverterConfig:
 # Field Transformation
 # =============================================================================
 
+# Markdown image tags: ![alt](url). Negated classes keep the match linear
+# (no lazy backtracking) and line-bound like ".*?"
+_MD_IMG_RE = re.compile(r'!\[[^\]\n]*\]\([^)\n]*\)')
+_MULTI_NEWLINE_RE = re.compile(r'\n{3,}')
+_YEAR_RE = re.compile(r'\((\d{4})\)')
+
+
 def extract_year(citation: str) -> str:
     """Extract year from citation string."""
-    match = re.search(r'\((\d{4})\)', citation)
+    match = _YEAR_RE.search(citation)
     return match.group(1) if match else datetime.now().strftime("%Y")
 
 
@@ -49,46 +67,75 @@ def clean_content(text: str) -> str:
         return ""
     
     # Remove markdown image tags
-    text = re.sub(r'!\[.*?\]\(.*?\)', '', text)
+    text = _MD_IMG_RE.sub('', text)
     
     # Normalize newlines
     text = text.replace("\\n", "\n")
     
     # Remove excess whitespace
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _MULTI_NEWLINE_RE.sub('\n\n', text)
     
     return text.strip()
 
 
-def transform_document(doc: Dict[str, Any], source: str) -> Dict[str, Any]:
+@dataclass
+class RagDocument:
+    """
+    Output record of transform_document.
+    
+    Slotted (no per-instance __dict__) and serialized directly by orjson,
+    which encodes dataclasses natively: no intermediate dict is built.
+    Field order is the output key order.
+    """
+    __slots__ = ("content", "source", "url", "date", "version", "title", "citation")
+    content: str
+    source: str
+    url: str
+    date: str
+    version: str
+    title: str
+    citation: str
+
+
+def transform_document(doc: Dict[str, Any], source: str) -> RagDocument:
     """
     Transform document to output format.
     
     Input format:  {Title, Citation, Link, Corpus}
     Output format: {content, source, url, date, title, citation, ...}
     """
-    output = {
-        "content": clean_content(doc.get("Corpus", "")),
-        "source": source,
-        "url": doc.get("Link", ""),
-        "date": extract_year(doc.get("Citation", "")),
-        "version": "1.0",
-        "title": doc.get("Title", ""),
-        "citation": doc.get("Citation", "")
-    }
-    
-    return output
+    citation = doc.get("Citation", "")
+    return RagDocument(
+        content=clean_content(doc.get("Corpus", "")),
+        source=source,
+        url=doc.get("Link", ""),
+        date=extract_year(citation),
+        version="1.0",
+        title=doc.get("Title", ""),
+        citation=citation
+    )
+
+
+def to_jsonl_line(doc: Union[RagDocument, Dict[str, Any]]) -> bytes:
+    """Serialize a document as one UTF-8 JSONL line (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(doc) + b'\n'
+    if isinstance(doc, RagDocument):
+        doc = {field: getattr(doc, field) for field in RagDocument.__slots__}
+    return (json.dumps(doc, ensure_ascii=False) + '\n').encode('utf-8')
 
 
 # =============================================================================
 # File Processing
 # =============================================================================
 
-def load_json_file(filepath: Path) -> Iterator[Dict[str, Any]]:
+def load_json_file(filepath: str) -> Iterator[Dict[str, Any]]:
     """Load JSON file and yield document(s)."""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        # Raw bytes: orjson decodes UTF-8 in C (no text-mode wrapper)
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
         
         if isinstance(data, list):
             yield from data
@@ -99,9 +146,35 @@ def load_json_file(filepath: Path) -> Iterator[Dict[str, Any]]:
         print(f"Error loading {filepath}: {e}")
 
 
-def find_json_files(directory: Path) -> Iterator[Path]:
-    """Find all JSON files in directory."""
-    return sorted(directory.glob("*.json"))
+def find_json_files(directory: Path) -> List[str]:
+    """
+    Find all JSON files in directory, sorted by name.
+    
+    Uses os.scandir: file names are compared as plain strings, the
+    directory entries already carry their file type (no extra stat calls)
+    and their full path as a str (no Path objects per file).
+    """
+    try:
+        with os.scandir(directory) as entries:
+            files = sorted(
+                (entry.name, entry.path) for entry in entries
+                if entry.name.endswith(".json") and entry.is_file()
+            )
+    except FileNotFoundError:
+        return []
+    return [path for _, path in files]
+
+
+def read_json_files(json_files: List[str], batches: Queue) -> None:
+    """
+    Reader thread of convert_to_jsonl: loads each file and queues
+    (filepath, documents), then None once all files are read.
+    """
+    try:
+        for filepath in json_files:
+            batches.put((filepath, list(load_json_file(filepath))))
+    finally:
+        batches.put(None)
 
 
 # =============================================================================
@@ -126,7 +199,7 @@ def convert_to_jsonl(config: ConverterConfig = None, transform: bool = True) ->
     print("=" * 60)
     
     # Find input files
-    json_files = list(find_json_files(config.input_dir))
+    json_files = find_json_files(config.input_dir)
     
     if not json_files:
         print(f"No JSON files found in {config.input_dir}")
@@ -140,14 +213,24 @@ def convert_to_jsonl(config: ConverterConfig = None, transform: bool = True) ->
     # Process
     stats = {"files": 0, "documents": 0, "errors": 0}
     
-    with open(output_file, 'w', encoding='utf-8') as out:
-        for filepath in json_files:
+    # Files are read and parsed in a background thread while this one
+    # transforms and writes, so disk reads overlap with encoding
+    batches = Queue(maxsize=config.read_queue_size)
+    reader = Thread(target=read_json_files, args=(json_files, batches), daemon=True)
+    reader.start()
+    
+    with open(output_file, 'wb', buffering=config.write_buffer_size) as out:
+        while True:
+            batch = batches.get()
+            if batch is None:
+                break
+            filepath, docs = batch
             try:
-                for doc in load_json_file(filepath):
+                for doc in docs:
                     if transform:
                         doc = transform_document(doc, config.source_name)
                     
-                    out.write(json.dumps(doc, ensure_ascii=False) + '\n')
+                    out.write(to_jsonl_line(doc))
                     stats["documents"] += 1
                 
                 stats["files"] += 1
@@ -159,6 +242,8 @@ def convert_to_jsonl(config: ConverterConfig = None, transform: bool = True) ->
                 print(f"Error processing {filepath}: {e}")
                 stats["errors"] += 1
     
+    reader.join()
+    
     # Summary
     print("-" * 60)
     print("CONVERSION COMPLETE")
@@ -2,7 +2,8 @@
 """
 PDF to Markdown Extraction Pipeline - Phase 1
 
-Extracts text from scientific PDFs using ML-based OCR (Marker library).
+Extracts text from scientific PDFs: born-digital PDFs are read from their
+text layer (pdfium), scanned/image-heavy PDFs go through ML-based OCR (Marker).
 Outputs structured JSON with text corpus and metadata for downstream processing.
 
 Author: Adrian Dominguez Castro
@@ -13,10 +14,16 @@ import json
 import re
 import logging
 import os
+import sys
+import gc
+import multiprocessing as mp
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from datetime import datetime
-from dataclasses import dataclass, asdict
-from typing import Optional
+from dataclasses import dataclass
+from typing import Optional, Tuple, List
 
 # ML/Deep Learning
 import torch
@@ -37,6 +44,13 @@ except ImportError:
 
 from marker.settings import settings
 import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 # =============================================================================
@@ -50,6 +64,10 @@ class PipelineConfig:
     output_dir: Path = Path("data/marker_outputs")
     log_dir: Path = Path("logs")
     batch_size: int = 1  # Lower = more accurate, higher = faster
+    fast_path: bool = True  # Read born-digital PDFs from their text layer (no Marker)
+    max_workers: Optional[int] = None  # Worker processes (None = 1 on GPU, one per CPU core otherwise)
+    inference_batch: Optional[int] = None  # Pages per model forward pass (None = Marker's per-device defaults)
+    pretty: bool = False  # Indented output JSON (debugging); compact otherwise
     
     def __post_init__(self):
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -63,11 +81,20 @@ class ExtractedDocument:
     metadata: dict
     
     def to_dict(self) -> dict:
-        return asdict(self)
-    
-    def save(self, filepath: Path):
+        # Plain dict of the fields (asdict would deep-copy the metadata)
+        return {"text": self.text, "metadata": self.metadata}
+    
+    def save(self, filepath: Path, pretty: bool = False):
+        # Compact by default; orjson and json produce the same UTF-8 bytes
+        if ORJSON_AVAILABLE:
+            option = orjson.OPT_INDENT_2 if pretty else None
+            filepath.write_bytes(orjson.dumps(self.to_dict(), option=option))
+            return
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+            if pretty:
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+            else:
+                json.dump(self.to_dict(), f, ensure_ascii=False, separators=(',', ':'))
 
 
 # =============================================================================
@@ -101,7 +128,7 @@ def setup_logging(log_dir: Path) -> logging.Logger:
 # Hardware Detection
 # =============================================================================
 
-def configure_hardware() -> dict:
+def configure_hardware(inference_batch: Optional[int] = None) -> dict:
     """
     Detect available hardware and configure Marker settings.
     Returns configuration info dict.
@@ -110,20 +137,23 @@ def configure_hardware() -> dict:
     device = "cuda" if has_gpu else "cpu"
     
     settings.TORCH_DEVICE = device
-    os.environ["SURYA_BATCH_SIZE"] = "1"  # Max accuracy
     
+    # Ampere and newer (compute capability 8.0+) run bfloat16 natively:
+    # same bandwidth as float16 without its overflow range
+    precision = "float32"
+    if has_gpu:
+        major, _ = torch.cuda.get_device_capability(0)
+        precision = "bfloat16" if major >= 8 else "float16"
+    
+    # Applied by PDFConverter when it loads the models (Marker's settings
+    # have no dtype field)
     config_info = {
         "device": device,
         "gpu_name": torch.cuda.get_device_name(0) if has_gpu else None,
-        "precision": "float16" if has_gpu else "float32"
+        "precision": precision,
+        "inference_batch": inference_batch
     }
     
-    if has_gpu:
-        try:
-            settings.TORCH_DTYPE = torch.float16
-        except AttributeError:
-            pass
-    
     return config_info
 
 
@@ -131,7 +161,15 @@ def configure_hardware() -> dict:
 # Metadata Extraction
 # =============================================================================
 
-def extract_doi(text: str, max_chars: int = 5000) -> Optional[str]:
+# DOI pattern: 10.XXXX/suffix
+_DOI_RE = re.compile(r'10\.\d{4,}/[^\s\]\)>",;]+', re.IGNORECASE)
+_DOI_TRAIL_RE = re.compile(r'[.,;:\]\)>]+$')
+
+# The DOI is searched in the first N characters (title page area)
+DOI_SEARCH_CHARS = 5000
+
+
+def extract_doi(text: str, max_chars: int = DOI_SEARCH_CHARS) -> Optional[str]:
     """
     Extract DOI from document text.
     Searches early pages to avoid bibliography references.
@@ -142,19 +180,18 @@ def extract_doi(text: str, max_chars: int = 5000) -> Optional[str]:
     # Focus on first N characters (title page area)
     search_text = text[:max_chars]
     
-    # DOI pattern: 10.XXXX/suffix
-    pattern = r'10\.\d{4,}/[^\s\]\)>",;]+'
-    
-    matches = re.findall(pattern, search_text, re.IGNORECASE)
+    # Every DOI starts with "10.": most texts are rejected by one substring scan
+    if "10." not in search_text:
+        return None
     
-    for match in matches:
+    for match in _DOI_RE.finditer(search_text):
         # Clean trailing punctuation
-        cleaned = re.sub(r'[.,;:\]\)>]+$', '', match)
+        cleaned = _DOI_TRAIL_RE.sub('', match.group())
         
         # Validate format
         if len(cleaned) >= 10 and '/' in cleaned:
             # Skip if looks like bibliography reference
-            context_start = max(0, search_text.find(match) - 100)
+            context_start = max(0, match.start() - 100)
             context = search_text[context_start:context_start + 200].lower()
             
             if not any(word in context for word in ['reference', 'cited', 'bibliography']):
@@ -163,16 +200,16 @@ def extract_doi(text: str, max_chars: int = 5000) -> Optional[str]:
     return None
 
 
-def extract_metadata_from_pdf(pdf_path: str, corpus: str = None) -> dict:
+def extract_metadata_from_pdf(pdf: Optional[pdfium.PdfDocument], corpus_head: str = None) -> dict:
     """
-    Extract metadata (title, DOI) from PDF file.
-    Uses PDF metadata and text content.
+    Extract metadata (title, DOI) from an open PDF (None: text only).
+    Uses PDF metadata and the start of the text content
+    (corpus_head: the first DOI_SEARCH_CHARS characters are enough).
     """
     metadata = {"title": None, "doi": None}
     
     try:
-        doc = pdfium.PdfDocument(pdf_path)
-        pdf_meta = doc.get_metadata_dict(skip_empty=True)
+        pdf_meta = pdf.get_metadata_dict(skip_empty=True) if pdf is not None else {}
         
         # Get title from PDF metadata
         if pdf_meta:
@@ -181,8 +218,8 @@ def extract_metadata_from_pdf(pdf_path: str, corpus: str = None) -> dict:
                 metadata["title"] = title
         
         # Extract DOI from corpus text
-        if corpus:
-            doi = extract_doi(corpus)
+        if corpus_head:
+            doi = extract_doi(corpus_head)
             if doi:
                 metadata["doi"] = doi
         
@@ -195,23 +232,192 @@ def extract_metadata_from_pdf(pdf_path: str, corpus: str = None) -> dict:
                         metadata["doi"] = doi
                         break
         
-        doc.close()
-        
     except Exception as e:
         print(f"  Warning: Could not extract metadata: {e}")
     
     return metadata
 
 
+# =============================================================================
+# Text Layer Extraction (fast path)
+# =============================================================================
+
+# A PDF is read from its text layer only if the sampled pages are mostly
+# text (little image area) and the text layer is dense enough; otherwise
+# it is treated as scanned and goes through Marker
+FAST_PATH_SAMPLE_PAGES = 3
+FAST_PATH_MAX_IMAGE_COVERAGE = 0.2
+FAST_PATH_MIN_CHARS_PER_PAGE = 500
+
+# Lines whose font is this much larger than the body font are headings
+HEADING_SIZE_RATIO = 1.2
+MAX_HEADING_LENGTH = 200
+
+_BULLET_RE = re.compile(r'^[\u2022\u25aa\u25e6\u25cf\-\*]\s*')
+_EXCESS_NEWLINES_RE = re.compile(r'\n{3,}')
+
+
+def object_bounds(obj) -> tuple:
+    """(left, bottom, right, top) of a page object (pypdfium2 4.x and 5.x)."""
+    get_bounds = getattr(obj, "get_bounds", None) or obj.get_pos
+    return get_bounds()
+
+
+def image_coverage(page) -> float:
+    """Fraction of the page area covered by image objects (0.0 - 1.0)."""
+    width, height = page.get_size()
+    page_area = width * height
+    if page_area <= 0:
+        return 0.0
+    
+    covered = 0.0
+    for obj in page.get_objects(filter=(pdfium_c.FPDF_PAGEOBJ_IMAGE,)):
+        left, bottom, right, top = object_bounds(obj)
+        covered += max(0.0, right - left) * max(0.0, top - bottom)
+    
+    return min(covered / page_area, 1.0)
+
+
+def page_lines(page) -> list:
+    """
+    Text layer of a page as (line, font_size) pairs.
+    The font size of a line is the size of its middle character
+    (unaffected by a drop cap merged into the line).
+    """
+    textpage = page.get_textpage()
+    try:
+        text = textpage.get_text_range()
+        lines = []
+        offset = 0
+        for raw_line in text.splitlines(keepends=True):
+            line = raw_line.strip()
+            if line:
+                middle_char = offset + raw_line.index(line[0]) + len(line) // 2
+                font_size = round(pdfium_c.FPDFText_GetFontSize(textpage, middle_char), 1)
+                lines.append((line, font_size))
+            else:
+                lines.append(("", 0.0))
+            offset += len(raw_line)
+        return lines
+    finally:
+        textpage.close()
+
+
+def lines_to_markdown(pages: list) -> str:
+    """
+    Renders the text lines of all pages as Markdown.
+    
+    Heuristics: the font size covering most characters is the body size;
+    larger sizes become headings (largest = "#"), single large letters
+    are drop caps joined to the following line, and bullet glyphs
+    become "- " list items.
+    """
+    size_chars = Counter()
+    for lines in pages:
+        for line, font_size in lines:
+            size_chars[font_size] += len(line)
+    
+    if not size_chars:
+        return ""
+    
+    body_size = size_chars.most_common(1)[0][0]
+    heading_sizes = sorted(
+        (size for size in size_chars if size >= body_size * HEADING_SIZE_RATIO),
+        reverse=True
+    )
+    heading_levels = {size: min(level, 3) for level, size in enumerate(heading_sizes, 1)}
+    
+    output = []
+    for lines in pages:
+        drop_cap = ""
+        for line, font_size in lines:
+            if not line:
+                output.append("")
+                continue
+            
+            # Drop cap: a single oversized letter opening the next line
+            if len(line) == 1 and line.isalpha() and font_size >= body_size * 2:
+                drop_cap = line
+                continue
+            if drop_cap:
+                line, drop_cap = drop_cap + line, ""
+            elif font_size in heading_levels and len(line) <= MAX_HEADING_LENGTH:
+                output.append("")
+                output.append(f"{'#' * heading_levels[font_size]} {line}")
+                output.append("")
+                continue
+            
+            bullet = _BULLET_RE.match(line)
+            if bullet and len(line) > bullet.end():
+                line = "- " + line[bullet.end():]
+            
+            output.append(line)
+        
+        output.append("")
+    
+    return _EXCESS_NEWLINES_RE.sub("\n\n", "\n".join(output)).strip()
+
+
+def extract_text_layer(pdf: pdfium.PdfDocument) -> Optional[str]:
+    """
+    Extract an open born-digital PDF from its text layer as Markdown.
+    Returns None if the PDF looks scanned/image-dominant (needs OCR).
+    """
+    page_count = len(pdf)
+    if page_count == 0:
+        return None
+    
+    sample_pages = min(page_count, FAST_PATH_SAMPLE_PAGES)
+    coverage = 0.0
+    pages = []
+    total_chars = 0
+    
+    for index in range(page_count):
+        page = pdf[index]
+        try:
+            if index < sample_pages:
+                coverage += image_coverage(page)
+            lines = page_lines(page)
+        finally:
+            page.close()
+        
+        # Reject image-dominant PDFs before reading the remaining pages
+        if index == sample_pages - 1 and coverage / sample_pages >= FAST_PATH_MAX_IMAGE_COVERAGE:
+            return None
+        
+        pages.append(lines)
+        total_chars += sum(len(line) for line, _ in lines)
+    
+    if total_chars < FAST_PATH_MIN_CHARS_PER_PAGE * page_count:
+        return None
+    
+    return lines_to_markdown(pages) or None
+
+
 # =============================================================================
 # PDF Conversion
 # =============================================================================
 
+# Marker converter options holding the batch size of each model stage
+MARKER_BATCH_OPTIONS = (
+    "layout_batch_size",
+    "detection_batch_size",
+    "recognition_batch_size",
+    "ocr_error_batch_size",
+    "table_rec_batch_size",
+    "equation_batch_size",
+)
+
+
 class PDFConverter:
-    """Handles PDF to Markdown conversion using Marker."""
+    """Handles PDF to Markdown conversion (text layer fast path, then Marker)."""
     
-    def __init__(self, logger: logging.Logger):
+    def __init__(self, logger: logging.Logger, fast_path_enabled: bool = True,
+                 inference_batch: Optional[int] = None, precision: Optional[str] = None):
         self.logger = logger
+        self.fast_path_enabled = fast_path_enabled
+        self.inference_batch = inference_batch
+        self.precision = precision
         self.models = None
         self.converter = None
         self._load_models()
@@ -224,20 +430,35 @@ class PDFConverter:
             raise RuntimeError("Marker library not available. Install with: pip install marker-pdf")
         
         try:
-            model_dict = create_model_dict()
-            self.converter = PdfConverter(model_dict)
+            # Model weights in the precision chosen by configure_hardware
+            # (None: Marker's default for the device)
+            dtype = getattr(torch, self.precision) if self.precision else None
+            model_dict = create_model_dict(dtype=dtype)
+            # Marker picks each model's batch size by device (e.g. larger
+            # recognition batches on CUDA); only override it when asked to
+            batch_config = {}
+            if self.inference_batch:
+                batch_config = {option: self.inference_batch for option in MARKER_BATCH_OPTIONS}
+            self.converter = PdfConverter(model_dict, config=batch_config)
             self.logger.info("Models loaded successfully")
         except Exception as e:
             self.logger.warning(f"Could not initialize PdfConverter: {e}")
             self.converter = None
             self.models = model_dict if 'model_dict' in dir() else None
     
-    def convert(self, pdf_path: Path) -> Optional[str]:
+    def convert(self, pdf_path: Path, pdf: Optional[pdfium.PdfDocument] = None) -> Optional[str]:
         """
         Convert PDF to Markdown text.
+        pdf: the PDF already opened with pdfium, if the caller has it.
         Returns extracted text or None on failure.
         """
         try:
+            # Born-digital PDFs: read the text layer, no ML models involved
+            if self.fast_path_enabled:
+                result = self._convert_text_layer(pdf_path, pdf)
+                if result:
+                    return result
+            
             # Try PdfConverter first
             if self.converter:
                 result = self._convert_with_converter(pdf_path)
@@ -256,6 +477,25 @@ class PDFConverter:
             self.logger.error(f"Conversion failed for {pdf_path.name}: {e}")
             return None
     
+    def _convert_text_layer(self, pdf_path: Path, pdf: Optional[pdfium.PdfDocument]) -> Optional[str]:
+        """Convert using the PDF text layer (None if the PDF needs OCR)."""
+        try:
+            if pdf is not None:
+                result = extract_text_layer(pdf)
+            else:
+                pdf = pdfium.PdfDocument(str(pdf_path))
+                try:
+                    result = extract_text_layer(pdf)
+                finally:
+                    pdf.close()
+        except Exception as e:
+            self.logger.warning(f"  Text layer extraction failed: {e}")
+            return None
+        
+        if result:
+            self.logger.info("  Extracted from text layer (Marker skipped)")
+        return result
+    
     def _convert_with_converter(self, pdf_path: Path) -> Optional[str]:
         """Convert using PdfConverter API."""
         try:
@@ -293,15 +533,27 @@ def process_pdf(pdf_path: Path, converter: PDFConverter, logger: logging.Logger)
     """
     logger.info(f"Processing: {pdf_path.name}")
     
-    # Convert PDF to text
-    corpus = converter.convert(pdf_path)
-    
-    if not corpus:
-        logger.warning(f"  Empty extraction for {pdf_path.name}")
-        return None
+    # One pdfium handle per PDF, shared by the text layer and metadata steps
+    try:
+        pdf = pdfium.PdfDocument(str(pdf_path))
+    except Exception as e:
+        logger.warning(f"  Could not open with pdfium: {e}")
+        pdf = None
     
-    # Extract metadata
-    metadata = extract_metadata_from_pdf(str(pdf_path), corpus)
+    try:
+        # Convert PDF to text
+        corpus = converter.convert(pdf_path, pdf)
+        
+        if not corpus:
+            logger.warning(f"  Empty extraction for {pdf_path.name}")
+            return None
+        
+        # Extract metadata
+        # Only the title page area is searched: pass just that slice
+        metadata = extract_metadata_from_pdf(pdf, corpus[:DOI_SEARCH_CHARS])
+    finally:
+        if pdf is not None:
+            pdf.close()
     
     logger.info(f"  Title: {metadata['title'] or 'Not found'}")
     logger.info(f"  DOI: {metadata['doi'] or 'Not found'}")
@@ -310,6 +562,115 @@ def process_pdf(pdf_path: Path, converter: PDFConverter, logger: logging.Logger)
     return ExtractedDocument(text=corpus, metadata=metadata)
 
 
+def find_pdf_files(directory: Path) -> List[Path]:
+    """
+    Find all PDF files in directory, sorted by name.
+    Uses os.scandir: plain suffix check, file type from the directory entry.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return sorted(
+                Path(entry.path) for entry in entries
+                if entry.name.endswith(".pdf") and entry.is_file()
+            )
+    except FileNotFoundError:
+        return []
+
+
+def list_names(directory: Path) -> set:
+    """File names in directory (one scandir instead of a stat per lookup)."""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
+
+
+# Per-process converter of the worker pool: loaded once by init_worker, or
+# inherited from the parent by forked workers (share_converter)
+_worker_converter = None
+_worker_logger = None
+
+
+def create_converter(config: PipelineConfig, logger: logging.Logger, hw_config: dict) -> PDFConverter:
+    """Build a PDFConverter with the pipeline settings and detected hardware."""
+    return PDFConverter(
+        logger,
+        fast_path_enabled=config.fast_path,
+        inference_batch=config.inference_batch,
+        precision=hw_config["precision"]
+    )
+
+
+def limit_torch_threads(workers: int):
+    """
+    Splits the CPU cores among the pool workers: torch's intra-op pool
+    defaults to every core, so N workers would run N x cores threads.
+    """
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // workers))
+
+
+def init_worker(config: PipelineConfig, workers: int):
+    """
+    Worker pool initializer: configures hardware and loads the Marker
+    models once per process, so they are reused for every PDF it gets.
+    """
+    global _worker_converter, _worker_logger
+    
+    _worker_logger = logging.getLogger("pdf_extraction")
+    if not _worker_logger.handlers:
+        _worker_logger = setup_logging(config.log_dir)
+    
+    hw_config = configure_hardware(config.inference_batch)
+    limit_torch_threads(workers)
+    _worker_converter = create_converter(config, _worker_logger, hw_config)
+
+
+def share_converter(converter: PDFConverter, logger: logging.Logger, workers: int):
+    """
+    Makes a converter loaded in this process the worker converter of
+    forked pool workers. The workers inherit the loaded models: weight pages
+    stay shared copy-on-write instead of each worker loading its own copy.
+    """
+    global _worker_converter, _worker_logger
+    
+    _worker_converter = converter
+    _worker_logger = logger
+    
+    # Inherited by the forked workers
+    limit_torch_threads(workers)
+    
+    # Keep the cyclic GC from writing to (and so copying) the pages of
+    # objects that exist before the fork
+    gc.freeze()
+
+
+def process_pdf_path(pdf_path: str) -> Tuple[str, Optional[ExtractedDocument]]:
+    """
+    Worker pool task: processes one PDF with the process-wide converter.
+    Returns (pdf_path, ExtractedDocument or None on failure).
+    """
+    try:
+        return pdf_path, process_pdf(Path(pdf_path), _worker_converter, _worker_logger)
+    except Exception as e:
+        _worker_logger.error(f"Processing failed for {Path(pdf_path).name}: {e}")
+        return pdf_path, None
+
+
+def resolve_workers(config: PipelineConfig, hw_config: dict, pending: int) -> int:
+    """
+    Number of worker processes: one on GPU (a single process keeps the
+    device busy), one per CPU core otherwise, never more than pending PDFs.
+    """
+    if config.max_workers:
+        workers = config.max_workers
+    elif hw_config["device"] == "cuda":
+        workers = 1
+    else:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, pending))
+
+
 def run_extraction_pipeline(config: PipelineConfig = None):
     """
     Run the complete PDF extraction pipeline.
@@ -327,48 +688,101 @@ def run_extraction_pipeline(config: PipelineConfig = None):
     logger.info("=" * 60)
     
     # Configure hardware
-    hw_config = configure_hardware()
+    hw_config = configure_hardware(config.inference_batch)
     logger.info(f"Device: {hw_config['device'].upper()}")
     if hw_config['gpu_name']:
         logger.info(f"GPU: {hw_config['gpu_name']}")
+    logger.info(f"Precision: {hw_config['precision']}")
+    if hw_config['inference_batch']:
+        logger.info(f"Inference batch: {hw_config['inference_batch']} pages")
+    else:
+        logger.info("Inference batch: Marker defaults")
     
     # Find PDFs
-    pdf_files = list(config.input_dir.glob("*.pdf"))
+    pdf_files = find_pdf_files(config.input_dir)
     if not pdf_files:
         logger.warning(f"No PDF files found in {config.input_dir}")
         return
     
     logger.info(f"Found {len(pdf_files)} PDF(s)")
     
-    # Initialize converter
-    try:
-        converter = PDFConverter(logger)
-    except Exception as e:
-        logger.error(f"Failed to initialize converter: {e}")
-        return
-    
-    # Process files
     stats = {"success": 0, "failed": 0, "skipped": 0}
     
+    # Skip if already processed
+    done = list_names(config.output_dir)
+    pending = []
     for pdf_path in pdf_files:
-        output_file = config.output_dir / f"{pdf_path.stem}.json"
-        
-        # Skip if already processed
-        if output_file.exists():
+        if f"{pdf_path.stem}.json" in done:
             logger.info(f"Skipping {pdf_path.name} (already processed)")
             stats["skipped"] += 1
-            continue
-        
-        # Process
-        doc = process_pdf(pdf_path, converter, logger)
-        
+        else:
+            pending.append(pdf_path)
+    
+    def save_result(pdf_path: Path, doc: Optional[ExtractedDocument]):
         if doc:
-            doc.save(output_file)
+            output_file = config.output_dir / f"{pdf_path.stem}.json"
+            doc.save(output_file, pretty=config.pretty)
             logger.info(f"  Saved: {output_file.name}")
             stats["success"] += 1
         else:
             stats["failed"] += 1
     
+    workers = resolve_workers(config, hw_config, len(pending)) if pending else 1
+    
+    if pending and workers == 1:
+        # Single process: load the models here, no pool overhead
+        try:
+            converter = create_converter(config, logger, hw_config)
+        except Exception as e:
+            logger.error(f"Failed to initialize converter: {e}")
+            return
+        
+        for pdf_path in pending:
+            save_result(pdf_path, process_pdf(pdf_path, converter, logger))
+    
+    elif pending:
+        # Worker pool: processes PDFs one at a time; results are saved here
+        logger.info(f"Workers: {workers}")
+        
+        if hw_config["device"] == "cpu" and sys.platform.startswith("linux"):
+            # Load the models once here; forked workers share them
+            try:
+                share_converter(create_converter(config, logger, hw_config), logger, workers)
+            except Exception as e:
+                logger.error(f"Failed to initialize converter: {e}")
+                return
+            pool_options = {"mp_context": mp.get_context("fork")}
+        else:
+            # Spawned workers (CUDA, already initialized here, cannot be
+            # used in a forked child): each loads the models once (init_worker)
+            pool_options = {
+                "mp_context": mp.get_context("spawn"),
+                "initializer": init_worker,
+                "initargs": (config, workers)
+            }
+        
+        # Results are saved as they complete, so a worker dying (failed
+        # initializer, or killed mid-PDF e.g. out of memory) only loses the
+        # PDFs that had not finished
+        broken = None
+        unprocessed = 0
+        with ProcessPoolExecutor(max_workers=workers, **pool_options) as executor:
+            futures = [executor.submit(process_pdf_path, str(pdf_path)) for pdf_path in pending]
+            for future in as_completed(futures):
+                try:
+                    pdf_path, doc = future.result()
+                except BrokenProcessPool as e:
+                    broken = e
+                    unprocessed += 1
+                    continue
+                save_result(Path(pdf_path), doc)
+        
+        if broken is not None:
+            cause = f" ({broken.__cause__})" if broken.__cause__ else ""
+            logger.error(f"Worker pool stopped: {broken}{cause}")
+            logger.error(f"  {unprocessed} PDF(s) not processed, counted as failed")
+            stats["failed"] += unprocessed
+    
     # Summary
     elapsed = (datetime.now() - start_time).total_seconds()
     
@@ -15,16 +15,41 @@ import time
 import logging
 import re
 import os
+import io
+import hashlib
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
-from dataclasses import dataclass, field
-from typing import Optional, List
+from dataclasses import dataclass, field, asdict
+from typing import Optional, List, Tuple
 from difflib import SequenceMatcher
 import xml.etree.ElementTree as ET
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pydantic import BaseModel, Field
 
+try:
+    from rapidfuzz import fuzz
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+try:
+    from lxml import etree as LET
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 # =============================================================================
 # Configuration
@@ -42,10 +67,28 @@ class EnrichmentConfig:
     api_key: str = field(default_factory=lambda: os.environ.get("PUBMED_API_KEY", ""))
     email: str = field(default_factory=lambda: os.environ.get("PUBMED_EMAIL", "user@example.com"))
     
+    # Files enriched concurrently (requests stay within the rate limit)
+    max_workers: int = 8
+    
+    # Indented output JSON (debugging); compact otherwise
+    pretty: bool = False
+    
+    # DOI hit with a local title: skip the details request and build a
+    # minimal citation (no authors/journal/year) from the local metadata
+    skip_efetch_when_doi_verified: bool = False
+    
+    # On-disk cache of PubMed lookups (None disables it)
+    cache_path: Optional[Path] = Path("data/pubmed_cache.sqlite")
+    
+    # Resolve all local DOIs in batched requests before the per-file pass
+    batch_doi_lookup: bool = True
+    
     def __post_init__(self):
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.failed_dir.mkdir(parents=True, exist_ok=True)
         self.log_dir.mkdir(parents=True, exist_ok=True)
+        if self.cache_path is not None:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Rate limit based on API key presence
         self.request_delay = 0.1 if self.api_key else 0.35
@@ -96,39 +139,225 @@ def setup_logger(log_dir: Path) -> logging.Logger:
     return logger
 
 
+class FileLogAdapter(logging.LoggerAdapter):
+    """
+    Prefixes messages with the name of the file being processed, so the
+    lines of files enriched concurrently can be told apart.
+    """
+    
+    def process(self, msg, kwargs):
+        return f"[{self.extra['file']}] {msg}", kwargs
+
+
 # =============================================================================
 # PubMed API Client
 # =============================================================================
 
+class RateLimiter:
+    """
+    Spaces calls at least `interval` seconds apart across all threads.
+    Each caller reserves the next free slot under a lock and sleeps
+    outside it, so concurrent requests never exceed 1/interval per second.
+    """
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+    
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# Title punctuation that breaks PubMed phrase search
+_TITLE_PUNCT_RE = re.compile(r'[;:,]')
+
+# Year at the start of an ESummary pubdate ("2019 Oct 12", "1999 Spring")
+_PUBDATE_YEAR_RE = re.compile(r'\d{4}')
+
+# PubMed XML fields, compiled once (lxml only)
+if LXML_AVAILABLE:
+    _ARTICLE_XP = LET.XPath("(//PubmedArticle)[1]")
+    _FIELD_XPS = (
+        ("title", LET.XPath("(.//ArticleTitle)[1]")),
+        ("doi", LET.XPath("(.//ArticleId[@IdType='doi'])[1]")),
+        ("journal", LET.XPath("(.//Journal/Title)[1]")),
+        ("year", LET.XPath("(.//PubDate/Year)[1]")),
+    )
+    _AUTHORS_XP = LET.XPath(".//Author")
+
+# lxml parsers must not be shared between threads: one per thread
+_lxml_local = threading.local()
+
+
+def _lxml_parser():
+    """The calling thread's lxml XMLParser."""
+    parser = getattr(_lxml_local, "parser", None)
+    if parser is None:
+        parser = LET.XMLParser(resolve_entities=False, remove_comments=True, remove_pis=True)
+        _lxml_local.parser = parser
+    return parser
+
+
+class PubMedCache:
+    """
+    On-disk cache of PubMed lookups (SQLite), shared by all worker threads.
+    
+    Keys: "doi:<normalized DOI>" and "title:<hash of the search term>" map
+    to a PMID, "pmid:<PMID>" to the record details. Only hits are stored,
+    so lookups that found nothing (or failed) are retried on the next run.
+    """
+    
+    def __init__(self, path: Path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pubmed_cache ("
+            "key TEXT PRIMARY KEY, payload BLOB NOT NULL, ts INTEGER NOT NULL)"
+        )
+        self._conn.commit()
+    
+    def get(self, key: str):
+        """Returns the cached value for key, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM pubmed_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return orjson.loads(row[0]) if ORJSON_AVAILABLE else json.loads(row[0])
+    
+    def put(self, key: str, value):
+        """Stores a JSON-serializable value for key."""
+        payload = orjson.dumps(value) if ORJSON_AVAILABLE else json.dumps(value).encode("utf-8")
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pubmed_cache (key, payload, ts) VALUES (?, ?, ?)",
+                (key, payload, int(time.time()))
+            )
+            self._conn.commit()
+    
+    def close(self):
+        """Closes the database."""
+        with self._lock:
+            self._conn.close()
+
+
 class PubMedClient:
     """Client for interacting with PubMed E-utilities API."""
     
     BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
     
+    # Transient failures (rate limited, server errors) are retried with backoff
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    
+    # DOIs per batched esearch/esummary round (see prefetch_dois)
+    DOI_BATCH_SIZE = 200
+    
     def __init__(self, config: EnrichmentConfig):
         self.config = config
         self.session = requests.Session()
+        
+        # Keep-alive pool large enough for every worker thread, so no
+        # request pays a new TLS handshake because its connection was evicted
+        pool_size = max(20, config.max_workers)
+        retries = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset(["GET", "POST"])
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
+        self.rate_limiter = RateLimiter(config.request_delay)
+        self._cache = None  # Opened on first use (see _get_cache)
+        self._cache_lock = threading.Lock()
+        
+        # Lookups resolved by prefetch_dois (same keys/values as the cache)
+        self._prefetched = {}
     
-    def _make_request(self, endpoint: str, params: dict) -> Optional[requests.Response]:
-        """Make API request with rate limiting."""
+    def close(self):
+        """
+        Closes the lookup cache and the HTTP session. The client stays
+        usable: the cache is reopened by the next lookup.
+        """
+        with self._cache_lock:
+            if self._cache is not None:
+                self._cache.close()
+                self._cache = None
+        self.session.close()
+    
+    def _get_cache(self) -> Optional[PubMedCache]:
+        """The lookup cache, opened on first use (None if disabled)."""
+        if self.config.cache_path is None:
+            return None
+        with self._cache_lock:
+            if self._cache is None:
+                self._cache = PubMedCache(self.config.cache_path)
+            return self._cache
+    
+    def _cached(self, key: str):
+        """Prefetched or cached value for key (None on miss)."""
+        value = self._prefetched.get(key)
+        if value is None:
+            try:
+                cache = self._get_cache()
+                if cache is not None:
+                    value = cache.get(key)
+            except (sqlite3.Error, ValueError):
+                # A broken cache is a miss, never a failed document
+                return None
+        return value
+    
+    def _store(self, key: str, value):
+        """Caches a lookup hit."""
+        if value is None:
+            return
+        try:
+            cache = self._get_cache()
+            if cache is not None:
+                cache.put(key, value)
+        except sqlite3.Error:
+            pass  # Not cached; looked up again next run
+    
+    def _make_request(self, endpoint: str, params: dict, post: bool = False) -> Optional[requests.Response]:
+        """Make API request with rate limiting (POST for long queries)."""
         if self.config.api_key:
             params["api_key"] = self.config.api_key
         params["email"] = self.config.email
         
+        # Shared by all worker threads: PubMed limits requests per second
+        self.rate_limiter.wait()
+        
         try:
-            response = self.session.get(
-                f"{self.BASE_URL}/{endpoint}",
-                params=params,
-                timeout=15
-            )
+            if post:
+                response = self.session.post(f"{self.BASE_URL}/{endpoint}", data=params, timeout=30)
+            else:
+                response = self.session.get(
+                    f"{self.BASE_URL}/{endpoint}",
+                    params=params,
+                    timeout=15
+                )
             response.raise_for_status()
-            time.sleep(self.config.request_delay)
             return response
         except Exception:
             return None
     
     def search_by_doi(self, doi: str) -> Optional[str]:
         """Search PubMed by DOI. Returns PMID if found."""
+        cache_key = f"doi:{DocumentVerifier.normalize_doi(doi)}"
+        pmid = self._cached(cache_key)
+        if pmid is not None:
+            return pmid
+        
         params = {
             "db": "pubmed",
             "term": f'"{doi}"[DOI]',
@@ -140,16 +369,23 @@ class PubMedClient:
         if response:
             data = response.json()
             ids = data.get("esearchresult", {}).get("idlist", [])
-            return ids[0] if ids else None
+            pmid = ids[0] if ids else None
+            self._store(cache_key, pmid)
+            return pmid
         return None
     
     def search_by_title(self, title: str, use_field: bool = True) -> Optional[str]:
         """Search PubMed by title. Returns PMID if found."""
         # Clean title for search
-        clean_title = re.sub(r'[;:,]', ' ', title.strip())
+        clean_title = _TITLE_PUNCT_RE.sub(' ', title.strip())
         
         search_term = f'"{clean_title}"[Title]' if use_field else clean_title
         
+        cache_key = "title:" + hashlib.sha1(search_term.encode("utf-8")).hexdigest()
+        pmid = self._cached(cache_key)
+        if pmid is not None:
+            return pmid
+        
         params = {
             "db": "pubmed",
             "term": search_term,
@@ -161,11 +397,157 @@ class PubMedClient:
         if response:
             data = response.json()
             ids = data.get("esearchresult", {}).get("idlist", [])
-            return ids[0] if ids else None
+            pmid = ids[0] if ids else None
+            self._store(cache_key, pmid)
+            return pmid
         return None
     
+    def prefetch_dois(self, dois: List[str]) -> int:
+        """
+        Resolve many DOIs at once: per batch of DOI_BATCH_SIZE, one esearch
+        ("doi1"[DOI] OR "doi2"[DOI] ...) kept on the history server and one
+        esummary of its results, instead of a search and a details request
+        per document. Records are matched back to the requested DOIs by the
+        DOI in their summary; later search_by_doi/fetch_details calls for
+        them are answered without a request.
+        
+        Returns the number of DOIs resolved.
+        """
+        pending = {}
+        for doi in dois:
+            key = DocumentVerifier.normalize_doi(doi)
+            if key and key not in pending and self._cached(f"doi:{key}") is None:
+                pending[key] = doi
+        
+        resolved = 0
+        keys = list(pending)
+        for start in range(0, len(keys), self.DOI_BATCH_SIZE):
+            batch = keys[start:start + self.DOI_BATCH_SIZE]
+            wanted = set(batch)
+            for pmid, result in self._fetch_doi_batch([pending[key] for key in batch]):
+                key = DocumentVerifier.normalize_doi(result.doi or "")
+                if key not in wanted:
+                    continue
+                wanted.discard(key)
+                self._prefetched[f"doi:{key}"] = pmid
+                self._prefetched[f"pmid:{pmid}"] = asdict(result)
+                self._store(f"doi:{key}", pmid)
+                self._store(f"pmid:{pmid}", asdict(result))
+                resolved += 1
+        
+        return resolved
+    
+    def _fetch_doi_batch(self, dois: List[str]) -> List[Tuple[str, PubMedResult]]:
+        """One esearch + esummary round for a DOI batch: [(pmid, result)]."""
+        params = {
+            "db": "pubmed",
+            "term": " OR ".join(f'"{doi}"[DOI]' for doi in dois),
+            "retmode": "json",
+            "retmax": 0,
+            "usehistory": "y"
+        }
+        
+        response = self._make_request("esearch.fcgi", params, post=True)
+        if not response:
+            return []
+        
+        try:
+            search = response.json().get("esearchresult", {})
+            count = int(search.get("count", 0))
+            webenv, query_key = search["webenv"], search["querykey"]
+        except Exception:
+            return []
+        
+        if not count:
+            return []
+        
+        params = {
+            "db": "pubmed",
+            "WebEnv": webenv,
+            "query_key": query_key,
+            "retmax": count,
+            "retmode": "json"
+        }
+        
+        response = self._make_request("esummary.fcgi", params)
+        if not response:
+            return []
+        
+        try:
+            data = orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
+            records = data.get("result", {})
+        except Exception:
+            return []
+        
+        results = []
+        for pmid in records.get("uids", []):
+            result = self._parse_summary(records.get(pmid), pmid)
+            if result is not None:
+                results.append((pmid, result))
+        return results
+    
+    @staticmethod
+    def doi_match_result(pmid: str, doi: str, title: str) -> PubMedResult:
+        """
+        Result for a PMID found by DOI search, built from the local title
+        and DOI without fetching the record (minimal citation).
+        """
+        return PubMedResult(
+            pmid=pmid,
+            title=title,
+            doi=doi,
+            authors=[],
+            journal="Unknown",
+            year="Unknown",
+            citation=f"{title}. PMID: {pmid}. https://doi.org/{doi}",
+            link=f"https://doi.org/{doi}"
+        )
+    
     def fetch_details(self, pmid: str) -> Optional[PubMedResult]:
-        """Fetch article details from PubMed."""
+        """
+        Fetch article details from PubMed.
+        Uses the compact ESummary JSON; the full EFetch XML record is only
+        requested if the summary lacks the citation fields.
+        """
+        cached = self.cached_details(pmid)
+        if cached is not None:
+            return cached
+        
+        result = self._fetch_details(pmid)
+        if result is not None:
+            self._store(f"pmid:{pmid}", asdict(result))
+        return result
+    
+    def cached_details(self, pmid: str) -> Optional[PubMedResult]:
+        """Article details already prefetched or cached (no request), or None."""
+        cached = self._cached(f"pmid:{pmid}")
+        return PubMedResult(**cached) if cached is not None else None
+    
+    def _fetch_details(self, pmid: str) -> Optional[PubMedResult]:
+        """fetch_details without the cache."""
+        params = {
+            "db": "pubmed",
+            "id": pmid,
+            "retmode": "json"
+        }
+        
+        response = self._make_request("esummary.fcgi", params)
+        if not response:
+            return None
+        
+        try:
+            data = orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
+            result = self._parse_summary(data.get("result", {}).get(pmid), pmid)
+        except Exception:
+            result = None
+        
+        if result is not None:
+            return result
+        
+        return self.fetch_details_xml(pmid)
+    
+    def fetch_details_xml(self, pmid: str) -> Optional[PubMedResult]:
+        """Fetch article details from the full PubMed XML record."""
         params = {
             "db": "pubmed",
             "id": pmid,
@@ -182,36 +564,58 @@ class PubMedClient:
         except Exception:
             return None
     
-    def _parse_pubmed_xml(self, xml_content: bytes, pmid: str) -> Optional[PubMedResult]:
-        """Parse PubMed XML response."""
-        root = ET.fromstring(xml_content)
-        article = root.find(".//PubmedArticle")
+    def _parse_summary(self, summary: Optional[dict], pmid: str) -> Optional[PubMedResult]:
+        """
+        Parse one ESummary JSON record.
+        Returns None if the record is missing, an error, or lacks title/journal.
+        """
+        if not summary or "error" in summary:
+            return None
         
-        if article is None:
+        title = summary.get("title")
+        journal = summary.get("fulljournalname")
+        if not title or not journal:
             return None
         
-        # Extract fields
-        title_el = article.find(".//ArticleTitle")
-        title = title_el.text if title_el is not None else "Unknown"
+        doi = next(
+            (item.get("value") for item in summary.get("articleids", []) if item.get("idtype") == "doi"),
+            None
+        )
         
-        doi_el = article.find(".//ArticleId[@IdType='doi']")
-        doi = doi_el.text if doi_el is not None else None
+        year_match = _PUBDATE_YEAR_RE.match(summary.get("pubdate", ""))
+        year = year_match.group() if year_match else "Unknown"
         
-        journal_el = article.find(".//Journal/Title")
-        journal = journal_el.text if journal_el is not None else "Unknown"
+        # ESummary names are "LastName Initials"
+        authors = [
+            author["name"] for author in summary.get("authors", [])
+            if author.get("name") and author.get("authtype", "Author") == "Author"
+        ]
         
-        year_el = article.find(".//PubDate/Year")
-        year = year_el.text if year_el is not None else "Unknown"
+        return self._build_result(pmid, title, doi, journal, year, authors)
+    
+    def _parse_pubmed_xml(self, xml_content: bytes, pmid: str) -> Optional[PubMedResult]:
+        """Parse PubMed XML response (first PubmedArticle)."""
+        if LXML_AVAILABLE:
+            article = self._read_article_lxml(xml_content)
+        else:
+            article = self._read_article_stream(xml_content)
         
-        # Extract authors
-        authors = []
-        for author in article.findall(".//Author"):
-            last = author.find("LastName")
-            first = author.find("ForeName")
-            if last is not None:
-                name = f"{last.text}, {first.text}" if first is not None else last.text
-                authors.append(name)
+        if article is None:
+            return None
         
+        fields, authors = article
+        return self._build_result(
+            pmid,
+            fields.get("title", "Unknown"),
+            fields.get("doi"),
+            fields.get("journal", "Unknown"),
+            fields.get("year", "Unknown"),
+            authors
+        )
+    
+    def _build_result(self, pmid: str, title: str, doi: Optional[str], journal: str,
+                      year: str, authors: List[str]) -> PubMedResult:
+        """Build the PubMedResult with its citation and link."""
         # Build citation
         author_str = self._format_authors(authors)
         citation = f"{author_str}. ({year}). {title}. {journal}"
@@ -232,6 +636,92 @@ class PubMedClient:
             link=link
         )
     
+    @staticmethod
+    def _add_author(authors: List[str], author) -> None:
+        """Appends 'LastName, ForeName' of an Author element (skipped without LastName)."""
+        last = author.find("LastName")
+        if last is not None:
+            first = author.find("ForeName")
+            name = f"{last.text}, {first.text}" if first is not None else last.text
+            authors.append(name)
+    
+    def _read_article_lxml(self, xml_content: bytes) -> Optional[Tuple[dict, List[str]]]:
+        """
+        Fields (title, doi, journal, year) and authors of the first
+        PubmedArticle, via lxml and precompiled XPath expressions.
+        """
+        root = LET.fromstring(xml_content, parser=_lxml_parser())
+        found = _ARTICLE_XP(root)
+        if not found:
+            return None
+        
+        article = found[0]
+        fields = {}
+        for name, xpath in _FIELD_XPS:
+            match = xpath(article)
+            if match:
+                fields[name] = match[0].text
+        
+        authors = []
+        for author in _AUTHORS_XP(article):
+            self._add_author(authors, author)
+        
+        return fields, authors
+    
+    def _read_article_stream(self, xml_content: bytes) -> Optional[Tuple[dict, List[str]]]:
+        """
+        Fields (title, doi, journal, year) and authors of the first
+        PubmedArticle, via the standard library.
+        
+        Streams the document with iterparse: each field is taken from the
+        first matching element in document order, elements are cleared
+        once read, and parsing stops at the end of the article.
+        """
+        fields = {}  # tag -> text of the first match
+        authors = []
+        stack = []  # Tags of the open elements
+        in_article = False
+        article_found = False
+        
+        for event, elem in ET.iterparse(io.BytesIO(xml_content), events=("start", "end")):
+            tag = elem.tag
+            
+            if event == "start":
+                stack.append(tag)
+                if tag == "PubmedArticle":
+                    in_article = True
+                continue
+            
+            stack.pop()
+            if not in_article:
+                continue
+            
+            if tag == "PubmedArticle":
+                article_found = True
+                break
+            
+            parent = stack[-1] if stack else None
+            
+            if tag == "ArticleTitle":
+                fields.setdefault("title", elem.text)
+            elif tag == "ArticleId" and elem.get("IdType") == "doi":
+                fields.setdefault("doi", elem.text)
+            elif tag == "Title" and parent == "Journal":
+                fields.setdefault("journal", elem.text)
+            elif tag == "Year" and parent == "PubDate":
+                fields.setdefault("year", elem.text)
+            elif tag == "Author":
+                self._add_author(authors, elem)
+            
+            # Author children are read when the Author element ends
+            if parent != "Author":
+                elem.clear()
+        
+        if not article_found:
+            return None
+        
+        return fields, authors
+    
     @staticmethod
     def _format_authors(authors: List[str]) -> str:
         """Format author list for citation."""
@@ -248,6 +738,13 @@ class PubMedClient:
 # Document Verification
 # =============================================================================
 
+# Compiled once: normalize_text runs for every title comparison
+_WORD_RE = re.compile(r'[^\w\s]')
+_WS_RE = re.compile(r'\s+')
+_DOI_URL_RE = re.compile(r'^https?://doi\.org/')
+_DOI_PREFIX_RE = re.compile(r'^doi:\s*')
+
+
 class DocumentVerifier:
     """Verifies document identity against PubMed results."""
     
@@ -255,18 +752,29 @@ class DocumentVerifier:
     def normalize_text(text: str) -> str:
         """Normalize text for comparison."""
         text = text.lower().strip()
-        text = re.sub(r'[^\w\s]', ' ', text)
-        text = re.sub(r'\s+', ' ', text)
+        text = _WORD_RE.sub(' ', text)
+        text = _WS_RE.sub(' ', text)
         return text
     
     @staticmethod
     def normalize_doi(doi: str) -> str:
         """Normalize DOI for comparison."""
         doi = doi.strip().lower()
-        doi = re.sub(r'^https?://doi\.org/', '', doi)
-        doi = re.sub(r'^doi:\s*', '', doi)
+        doi = _DOI_URL_RE.sub('', doi)
+        doi = _DOI_PREFIX_RE.sub('', doi)
         return doi
     
+    @staticmethod
+    def title_similarity(a: str, b: str) -> float:
+        """
+        Similarity of two normalized titles (0.0 - 1.0).
+        rapidfuzz's C implementation when available, difflib otherwise
+        (both measure matching characters over total length).
+        """
+        if RAPIDFUZZ_AVAILABLE:
+            return fuzz.ratio(a, b) / 100.0
+        return SequenceMatcher(None, a, b).ratio()
+    
     def verify(self, local_title: str, local_doi: str, 
                pubmed_result: PubMedResult) -> tuple[bool, bool]:
         """
@@ -288,7 +796,7 @@ class DocumentVerifier:
             local_norm = self.normalize_text(local_title)
             pub_norm = self.normalize_text(pubmed_result.title)
             
-            similarity = SequenceMatcher(None, local_norm, pub_norm).ratio()
+            similarity = self.title_similarity(local_norm, pub_norm)
             
             if similarity >= 0.90:
                 return True, False  # Verified by title, no DOI output
@@ -300,6 +808,30 @@ class DocumentVerifier:
 # Enrichment Pipeline
 # =============================================================================
 
+def find_json_files(directory: Path) -> List[Path]:
+    """
+    Find all JSON files in directory, sorted by name.
+    Uses os.scandir: plain suffix check, file type from the directory entry.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return sorted(
+                Path(entry.path) for entry in entries
+                if entry.name.endswith(".json") and entry.is_file()
+            )
+    except FileNotFoundError:
+        return []
+
+
+def list_names(directory: Path) -> set:
+    """File names in directory (one scandir instead of a stat per lookup)."""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
+
+
 class EnrichmentPipeline:
     """Main enrichment pipeline."""
     
@@ -324,7 +856,7 @@ class EnrichmentPipeline:
             self.logger.info("No API key (3 req/sec) - set PUBMED_API_KEY for faster processing")
         
         # Find input files
-        json_files = list(self.config.input_dir.glob("*.json"))
+        json_files = find_json_files(self.config.input_dir)
         if not json_files:
             self.logger.warning(f"No JSON files in {self.config.input_dir}")
             return
@@ -334,18 +866,36 @@ class EnrichmentPipeline:
         # Process
         stats = {"success": 0, "failed": 0, "skipped": 0}
         
+        done = list_names(self.config.output_dir)
+        pending = []
         for json_file in json_files:
             output_file = self.config.output_dir / f"{json_file.stem}_final.json"
             
-            if output_file.exists():
+            if output_file.name in done:
                 self.logger.info(f"Skipping {json_file.name} (exists)")
                 stats["skipped"] += 1
                 continue
             
-            if self._process_file(json_file, output_file):
-                stats["success"] += 1
-            else:
-                stats["failed"] += 1
+            pending.append((json_file, output_file))
+        
+        if pending:
+            try:
+                if self.config.batch_doi_lookup:
+                    self._prefetch_dois([input_file for input_file, _ in pending])
+                
+                # Files are network-bound: enrich several at once, the client's
+                # rate limiter keeps the combined request rate within PubMed's limit
+                workers = max(1, min(self.config.max_workers, len(pending)))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [executor.submit(self._process_file, *paths) for paths in pending]
+                    for future in as_completed(futures):
+                        if future.result():
+                            stats["success"] += 1
+                        else:
+                            stats["failed"] += 1
+            finally:
+                # Reopened by the next run
+                self.client.close()
         
         # Summary
         elapsed = (datetime.now() - start_time).total_seconds()
@@ -355,14 +905,35 @@ class EnrichmentPipeline:
         self.logger.info(f"Time: {elapsed:.1f}s")
         self.logger.info("=" * 60)
     
+    def _prefetch_dois(self, input_files: List[Path]):
+        """Resolve the local DOIs of all input files in batched requests."""
+        dois = []
+        for input_file in input_files:
+            try:
+                raw = input_file.read_bytes()
+                data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+                doi = (data.get("metadata") or {}).get("doi")
+            except Exception:
+                continue  # Reported by _process_file
+            if doi:
+                dois.append(doi)
+        
+        if not dois:
+            return
+        
+        self.logger.info(f"Batch DOI lookup: {len(dois)} DOI(s)")
+        resolved = self.client.prefetch_dois(dois)
+        self.logger.info(f"  Resolved {resolved} DOI(s) in PubMed")
+    
     def _process_file(self, input_file: Path, output_file: Path) -> bool:
         """Process a single file."""
-        self.logger.info(f"Processing: {input_file.name}")
+        log = FileLogAdapter(self.logger, {"file": input_file.name})
+        log.info("Processing")
         
         try:
-            # Load input
-            with open(input_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # Load input (raw bytes: orjson decodes UTF-8 in C)
+            raw = input_file.read_bytes()
+            data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
             
             corpus = data.get("text", "")
             metadata = data.get("metadata", {})
@@ -370,48 +941,60 @@ class EnrichmentPipeline:
             local_doi = metadata.get("doi")
             
             if not corpus:
-                self._move_to_failed(input_file, "Empty corpus")
+                self._move_to_failed(input_file, log, "Empty corpus")
                 return False
             
             # Search PubMed
-            pubmed_result = self._search_pubmed(local_doi, local_title)
+            pubmed_result = self._search_pubmed(local_doi, local_title, log)
             
             # Build output
-            doc = self._build_output(corpus, local_title, local_doi, pubmed_result)
+            doc = self._build_output(corpus, local_title, local_doi, pubmed_result, log)
             
-            # Save
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(doc.model_dump(), f, ensure_ascii=False, indent=2)
+            # Save (compact by default; orjson and json produce the same UTF-8 bytes)
+            if ORJSON_AVAILABLE:
+                option = orjson.OPT_INDENT_2 if self.config.pretty else None
+                output_file.write_bytes(orjson.dumps(doc.model_dump(), option=option))
+            else:
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    if self.config.pretty:
+                        json.dump(doc.model_dump(), f, ensure_ascii=False, indent=2)
+                    else:
+                        json.dump(doc.model_dump(), f, ensure_ascii=False, separators=(',', ':'))
             
-            self.logger.info(f"  Saved: {output_file.name}")
+            log.info(f"Saved: {output_file.name}")
             return True
             
         except Exception as e:
-            self.logger.error(f"  Error: {e}")
-            self._move_to_failed(input_file, str(e))
+            log.error(f"Error: {e}")
+            self._move_to_failed(input_file, log, str(e))
             return False
     
-    def _search_pubmed(self, doi: str, title: str) -> Optional[PubMedResult]:
+    def _search_pubmed(self, doi: str, title: str, log: FileLogAdapter) -> Optional[PubMedResult]:
         """Search PubMed by DOI then title."""
         pmid = None
         
         # Try DOI first
         if doi:
-            self.logger.info(f"  Searching by DOI: {doi}")
+            log.info(f"Searching by DOI: {doi}")
             pmid = self.client.search_by_doi(doi)
             if pmid:
-                self.logger.info(f"  Found PMID: {pmid}")
+                log.info(f"Found PMID: {pmid}")
+                
+                # PubMed indexes this DOI: the record is identified already.
+                # Full details on hand (prefetched/cached) cost no request
+                if self.config.skip_efetch_when_doi_verified and title:
+                    return self.client.cached_details(pmid) or self.client.doi_match_result(pmid, doi, title)
         
         # Try title
         if not pmid and title:
-            self.logger.info(f"  Searching by title: {title[:60]}...")
+            log.info(f"Searching by title: {title[:60]}...")
             pmid = self.client.search_by_title(title, use_field=True)
             
             if not pmid:
                 pmid = self.client.search_by_title(title, use_field=False)
             
             if pmid:
-                self.logger.info(f"  Found PMID: {pmid}")
+                log.info(f"Found PMID: {pmid}")
         
         # Fetch details
         if pmid:
@@ -420,7 +1003,7 @@ class EnrichmentPipeline:
         return None
     
     def _build_output(self, corpus: str, local_title: str, local_doi: str,
-                      pubmed_result: Optional[PubMedResult]) -> EnrichedDocument:
+                      pubmed_result: Optional[PubMedResult], log: FileLogAdapter) -> EnrichedDocument:
         """Build output document."""
         
         if pubmed_result:
@@ -436,7 +1019,7 @@ class EnrichmentPipeline:
                 )
         
         # Fallback - unverified
-        self.logger.info("  Using fallback (unverified)")
+        log.info("Using fallback (unverified)")
         fallback_title = local_title or "Unknown Title"
         fallback_citation = f"Document. {fallback_title}. (Unverified)"
         
@@ -447,13 +1030,13 @@ class EnrichmentPipeline:
             Corpus=corpus
         )
     
-    def _move_to_failed(self, file: Path, reason: str):
+    def _move_to_failed(self, file: Path, log: FileLogAdapter, reason: str):
         """Move file to failed directory."""
         try:
             shutil.move(str(file), str(self.config.failed_dir / file.name))
-            self.logger.warning(f"  Moved to failed: {reason}")
+            log.warning(f"Moved to failed: {reason}")
         except Exception as e:
-            self.logger.error(f"  Could not move file: {e}")
+            log.error(f"Could not move file: {e}")
 
 
 # =============================================================================